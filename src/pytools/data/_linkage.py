@@ -9,7 +9,7 @@ Linkage Tree.
 from __future__ import annotations
 
 from copy import copy
-from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from typing import Iterable, Iterator, List, Optional, Sized, Tuple, Union, overload
 
 import numpy as np
 import numpy.typing as npt
@@ -122,41 +122,34 @@ class LinkageTree(HasExpressionRepr):
         n_branches = len(scipy_linkage_matrix)
         n_leaves = n_branches + 1
 
-        def _validate_leaves(var: Sequence[Any], var_name: str) -> None:
+        def _validate_leaves(var: Sized, var_name: str) -> None:
             if len(var) != n_leaves:
                 raise ValueError(f"expected {n_leaves} values for arg {var_name}")
 
         self.scipy_linkage_matrix = scipy_linkage_matrix
 
         leaf_names = [str(name) for name in leaf_names]
-        leaf_weights = [float(weight) for weight in leaf_weights]
+        leaf_weights = np.array([float(weight) for weight in leaf_weights])
 
         _validate_leaves(leaf_names, "leaf_labels")
         _validate_leaves(leaf_weights, "leaf_weights")
 
-        if any(not (0.0 <= weight <= 1.0) for weight in leaf_weights):
+        if not ((leaf_weights >= 0.0) & (leaf_weights <= 1.0)).all():
             raise ValueError(
                 "all values in arg leaf_weights are required to be in the range "
                 "from 0.0 to 1.0"
             )
 
-        self._nodes: List[Node] = [
-            *[
-                LeafNode(index=index, name=label, weight=weight)
-                for index, (label, weight) in enumerate(zip(leaf_names, leaf_weights))
-            ],
-            *[
-                LinkageNode(
-                    index=index + n_leaves,
-                    children_distance=scipy_linkage_matrix[index][
-                        LinkageTree.__F_CHILDREN_DISTANCE
-                    ],
-                )
-                for index in range(n_branches)
-            ],
-        ]
+        # the attributes of all nodes are stored column-wise: the leaf names and
+        # weights in the lists below, and the children and distances of the branches
+        # in the linkage matrix; node objects are only created on demand
+        self._leaf_names = leaf_names
+        self._leaf_weights = leaf_weights
+        self._nodes: List[Optional[Node]] = [None] * (n_leaves + n_branches)
 
-        root_children_distance = self._nodes[-1].children_distance
+        root_children_distance = scipy_linkage_matrix[-1][
+            LinkageTree.__F_CHILDREN_DISTANCE
+        ]
         if max_distance is None:
             max_distance = root_children_distance
         elif max_distance < root_children_distance:
@@ -175,7 +168,7 @@ class LinkageTree(HasExpressionRepr):
         """
         The root node of the linkage tree.
         """
-        return self._nodes[-1]
+        return self._node(len(self._nodes) - 1)
 
     def children(self, node: Node) -> Optional[Tuple[Node, Node]]:
         """
@@ -189,7 +182,7 @@ class LinkageTree(HasExpressionRepr):
         nodes = self._nodes
 
         # check that the node is included in this tree
-        if node_index >= len(nodes) or node is not nodes[node_index]:
+        if not 0 <= node_index < len(nodes) or node is not nodes[node_index]:
             raise ValueError("arg node is not a node in this linkage tree")
 
         if node.is_leaf:
@@ -200,7 +193,7 @@ class LinkageTree(HasExpressionRepr):
             ix_c1, ix_c2 = node_linkage[
                 [LinkageTree.__F_CHILD_LEFT, LinkageTree.__F_CHILD_RIGHT]
             ].astype(int)
-            return nodes[ix_c1], nodes[ix_c2]
+            return self._node(ix_c1), self._node(ix_c2)
 
     @property
     def n_leaves(self) -> int:
@@ -218,34 +211,47 @@ class LinkageTree(HasExpressionRepr):
         :return: a copy of this linkage tree with sorting applied
         """
 
-        linkage: LinkageMatrix = self.scipy_linkage_matrix.copy()
-
-        def _sort_node(n: Node) -> Tuple[float, int]:
-            # sort a linkage node and return its total weight and leaf count
+        n_leaves = self.n_leaves
+        linkage: LinkageMatrix = self.scipy_linkage_matrix
 
-            if n.is_leaf:
-                return n.weight, 1
+        # total weight and leaf count of every node, computed bottom-up: the scipy
+        # linkage matrix lists branches in order of creation, so both children of a
+        # branch always precede it
+        weights: List[float] = self._leaf_weights.tolist()
+        leaf_counts: List[int] = [1] * n_leaves
 
-            children = self.children(n)
-            assert children is not None, ASSERTION_CURRENT_NODE_NOT_A_LEAF
-            l, r = children
+        # indices of the branches whose children need to be swapped
+        swaps: List[int] = []
 
-            weight_left, leaves_left = _sort_node(l)
-            weight_right, leaves_right = _sort_node(r)
+        for ix_branch, (ix_left, ix_right) in enumerate(
+            linkage[:, [LinkageTree.__F_CHILD_LEFT, LinkageTree.__F_CHILD_RIGHT]]
+            .astype(int)
+            .tolist()
+        ):
+            weight_left = weights[ix_left]
+            weight_right = weights[ix_right]
+            leaves_left = leaf_counts[ix_left]
+            leaves_right = leaf_counts[ix_right]
 
             if weight_left / leaves_left < weight_right / leaves_right:
                 # swap nodes if the right node has the higher weight
-                n_linkage = linkage[n.index - self.n_leaves]
-                n_linkage[
-                    [LinkageTree.__F_CHILD_RIGHT, LinkageTree.__F_CHILD_LEFT]
-                ] = n_linkage[[LinkageTree.__F_CHILD_LEFT, LinkageTree.__F_CHILD_RIGHT]]
-
-            return weight_left + weight_right, leaves_left + leaves_right
+                swaps.append(ix_branch)
 
-        _sort_node(self.root)
+            weights.append(weight_left + weight_right)
+            leaf_counts.append(leaves_left + leaves_right)
 
         linkage_sorted = copy(self)
-        linkage_sorted.scipy_linkage_matrix = linkage
+
+        if swaps:
+            # only copy the linkage matrix if at least one branch is swapped
+            linkage = linkage.copy()
+            linkage[
+                np.ix_(swaps, [LinkageTree.__F_CHILD_LEFT, LinkageTree.__F_CHILD_RIGHT])
+            ] = linkage[
+                np.ix_(swaps, [LinkageTree.__F_CHILD_RIGHT, LinkageTree.__F_CHILD_LEFT])
+            ]
+            linkage_sorted.scipy_linkage_matrix = linkage
+
         return linkage_sorted
 
     def iter_nodes(self, inner: bool = True) -> Iterator[Node]:
@@ -274,23 +280,68 @@ class LinkageTree(HasExpressionRepr):
     def __len__(self) -> int:
         return len(self._nodes)
 
+    @overload
     def __getitem__(self, item: int) -> Node:
-        return self._nodes[item]
+        pass
+
+    @overload
+    def __getitem__(self, item: slice) -> List[Node]:
+        pass
+
+    def __getitem__(self, item: Union[int, slice]) -> Union[Node, List[Node]]:
+        n_nodes = len(self._nodes)
+        if isinstance(item, slice):
+            return [self._node(index) for index in range(n_nodes)[item]]
+        if not -n_nodes <= item < n_nodes:
+            raise IndexError("linkage tree index out of range")
+        return self._node(item % n_nodes)
+
+    def _node(self, index: int) -> Node:
+        # get the node at the given non-negative index, creating it if necessary
+        node = self._nodes[index]
+        if node is None:
+            n_leaves = self.n_leaves
+            if index < n_leaves:
+                node = LeafNode(
+                    index=index,
+                    name=self._leaf_names[index],
+                    weight=float(self._leaf_weights[index]),
+                )
+            else:
+                node = LinkageNode(
+                    index=index,
+                    children_distance=self.scipy_linkage_matrix[index - n_leaves][
+                        LinkageTree.__F_CHILDREN_DISTANCE
+                    ],
+                )
+            self._nodes[index] = node
+        return node
 
     def to_expression(self) -> Expression:
         """[see superclass]"""
 
-        def _expr(n: Node) -> Expression:
-            if n.is_leaf:
-                return n.to_expression()
-            else:
-                children = self.children(n)
-                assert children is not None, ASSERTION_CURRENT_NODE_NOT_A_LEAF
-                l, r = children
-                return n.to_expression()[_expr(l), _expr(r)]
+        nodes = [self._node(index) for index in range(len(self._nodes))]
+        n_leaves = self.n_leaves
+
+        # build the expressions bottom-up: the scipy linkage matrix lists branches
+        # in order of creation, so both children of a branch always precede it
+        expressions: List[Expression] = [
+            node.to_expression() for node in nodes[:n_leaves]
+        ]
+        for node, (ix_left, ix_right) in zip(
+            nodes[n_leaves:],
+            self.scipy_linkage_matrix[
+                :, [LinkageTree.__F_CHILD_LEFT, LinkageTree.__F_CHILD_RIGHT]
+            ]
+            .astype(int)
+            .tolist(),
+        ):
+            expressions.append(
+                node.to_expression()[expressions[ix_left], expressions[ix_right]]
+            )
 
         return Id(type(self))(
-            _expr(self.root),
+            expressions[-1],
             max_distance=self.max_distance,
             leaf_label=self.leaf_label,
             weight_label=self.weight_label,
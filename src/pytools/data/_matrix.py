@@ -32,6 +32,15 @@ __all__ = ["Matrix"]
 T_Matrix = TypeVar("T_Matrix", bound="Matrix[Any]")
 T_Number = TypeVar("T_Number", bound="np.number[npt.NBitBase]")
 
+
+#
+# Constants
+#
+
+# maximum number of weights to sort when resizing by weight ratio; of larger numbers
+# of weights, only the highest weights are sorted if possible
+_WEIGHT_SORT_MAX_SIZE = 4096
+
 #
 # Ensure all symbols introduced below are included in __all__
 #
@@ -56,7 +65,7 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
     #: the names of the rows and columns
     names: Tuple[Optional[npt.NDArray[Any]], Optional[npt.NDArray[Any]]]
 
-    #: the weights of the rows and columns
+    #: the weights of the rows and columns, as read-only arrays
     weights: Tuple[Optional[npt.NDArray[np.float_]], Optional[npt.NDArray[np.float_]]]
 
     #: the labels for the row and column axes
@@ -68,6 +77,12 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
     #: the label for the weight axis
     weight_label: Optional[str]
 
+    # for the row and column axes: the weights most recently used to resize the
+    # axis, and their descending stable order (if already determined)
+    _weights_order: List[
+        Optional[Tuple[npt.NDArray[np.float_], Optional[npt.NDArray[np.intp]]]]
+    ]
+
     def __init__(
         self,
         values: npt.NDArray[T_Number],
@@ -85,7 +100,8 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
         :param names: the names of the rows and columns as a pair of iterables
             (each of which may be ``None`` if not applicable)
         :param weights: the weights of the rows and columns as a pair of iterables
-            (each of which may be ``None`` if not applicable)
+            (each of which may be ``None`` if not applicable); numpy arrays may be
+            used by the matrix without copying, and must not be modified afterwards
         :param value_label: the label for the value axis
         :param name_labels: the labels for the row and column axes as a pair of strings
         :param weight_label: the label for the weight axis
@@ -102,25 +118,9 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
             )
         self.values = values
 
-        args: List[Tuple[Any, str]] = [
-            (names, "names"),
-            (weights, "weights"),
-            (name_labels, "name_labels"),
-        ]
-
-        for arg, arg_name in args:
-            if arg is None:
-                continue
-            if not isinstance(arg, tuple):
-                raise TypeError(
-                    f"arg {arg_name} expected to be tuple, but got a "
-                    f"{type(arg).__name__}"
-                )
-            if len(arg) != 2:
-                raise ValueError(
-                    f"optional arg {arg_name} expected to be 2-tuple, "
-                    f"but got a {len(arg)}-tuple"
-                )
+        _validate_pair(names, "names")
+        _validate_pair(weights, "weights")
+        _validate_pair(name_labels, "name_labels")
 
         def _arg_to_array(
             axis: int, axis_arg: Optional[Iterable[Any]], arg_name_: str
@@ -128,7 +128,12 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
             if axis_arg is None:
                 return None
             else:
-                arr = np.asarray(axis_arg)
+                # avoid copying arrays and indices that are already backed by numpy
+                arr: npt.NDArray[Any] = (
+                    axis_arg.to_numpy(copy=False)
+                    if isinstance(axis_arg, pd.Index)
+                    else np.asarray(axis_arg)
+                )
                 if arr.ndim != 1:
                     raise ValueError(
                         f"arg {arg_name_}[{axis}] must be a 1d array, but has "
@@ -153,22 +158,46 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
         if weights is None:
             self.weights = (None, None)
         else:
+            weights_rows = _arg_to_array(0, weights[0], "weights")
+            weights_columns = _arg_to_array(1, weights[1], "weights")
+
+            weights_arrays: List[npt.NDArray[Any]]
+            if (
+                weights_rows is not None
+                and weights_columns is not None
+                and weights_rows.dtype == weights_columns.dtype
+            ):
+                # keep row and column weights as views of a single contiguous array,
+                # unless this would change the type of the weights of either axis
+                weights_all = np.concatenate((weights_rows, weights_columns))
+                n_rows = len(weights_rows)
+                weights_rows = weights_all[:n_rows]
+                weights_columns = weights_all[n_rows:]
+                weights_arrays = [weights_all]
+            else:
+                weights_arrays = [
+                    arr for arr in (weights_rows, weights_columns) if arr is not None
+                ]
+
+            # validate the weights of both axes, in a single pass if they share an
+            # array
+            if any(arr.size and arr.min() < 0 for arr in weights_arrays):
+                # determine the axis with negative weights
+                axis = (
+                    0
+                    if weights_rows is not None
+                    and weights_rows.size
+                    and weights_rows.min() < 0
+                    else 1
+                )
+                raise ValueError(
+                    f"arg weights[{axis}] should be all positive, "
+                    "but contains negative weights"
+                )
 
-            def _ensure_positive(
-                w: Optional[npt.NDArray[np.float_]], axis: int
-            ) -> Optional[npt.NDArray[np.float_]]:
-                if w is not None and (w < 0).any():
-                    raise ValueError(
-                        f"arg weights[{axis}] should be all positive, "
-                        "but contains negative weights"
-                    )
-                else:
-                    return w
-
-            self.weights = (
-                _ensure_positive(_arg_to_array(0, weights[0], "weights"), axis=0),
-                _ensure_positive(_arg_to_array(1, weights[1], "weights"), axis=1),
-            )
+            # weights are read-only, so that the order of weights cached for resizing
+            # cannot become stale
+            self.weights = (_read_only(weights_rows), _read_only(weights_columns))
 
         self.name_labels = (
             validate_element_types(
@@ -186,6 +215,8 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
             weight_label, expected_type=str, optional=True, name="arg weight_label"
         )
 
+        self._weights_order = [None, None]
+
     @classmethod
     def from_frame(
         cls: Type[T_Matrix],
@@ -208,8 +239,11 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
         :return:
         """
         return cls(
-            frame.values,
-            names=(frame.index, frame.columns),
+            frame.to_numpy(copy=False),
+            names=(
+                frame.index.to_numpy(copy=False),
+                frame.columns.to_numpy(copy=False),
+            ),
             weights=weights,
             name_labels=name_labels,
             value_label=value_label,
@@ -266,38 +300,71 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
         else:
             raise ValueError(f"arg size={size!r} must be a number or a pair of numbers")
 
-        n_rows_current, n_columns_current = self.values.shape
         weights_rows, weights_columns = self.weights
         names_rows, names_columns = self.names
 
-        values = self.values
-
-        if rows:
-            values, weights_rows, names_rows = _resize_rows(
-                values=values,
-                weights=weights_rows,
-                names=names_rows,
-                current_size=n_rows_current,
-                target_size=_validate_resize_arg(rows, n_rows_current, "row"),
-            )
+        values, weights_rows, names_rows = _resize_axis(
+            values=self.values,
+            weights=weights_rows,
+            weights_order=self._get_weights_order(0) if rows else None,
+            names=names_rows,
+            size=rows,
+            axis=0,
+            axis_name="row",
+        )
 
-        if columns:
-            values_t, weights_columns, names_columns = _resize_rows(
-                values=values.T,
-                weights=weights_columns,
-                names=names_columns,
-                current_size=n_columns_current,
-                target_size=_validate_resize_arg(columns, n_columns_current, "column"),
-            )
-            values = values_t.T
+        values, weights_columns, names_columns = _resize_axis(
+            values=values,
+            weights=weights_columns,
+            weights_order=self._get_weights_order(1) if columns else None,
+            names=names_columns,
+            size=columns,
+            axis=1,
+            axis_name="column",
+        )
 
         resized = copy(self)
         resized.values = values
         resized.names = (names_rows, names_columns)
-        resized.weights = (weights_rows, weights_columns)
+        resized.weights = (_read_only(weights_rows), _read_only(weights_columns))
+        resized._weights_order = [None, None]
 
         return resized
 
+    def _get_weights_order(self, axis: int) -> Optional[npt.NDArray[np.intp]]:
+        # Get the descending stable order of the weights along the given axis.
+        #
+        # A single resize does not require sorting all weights, so the order is only
+        # determined once the same weights are used to resize an axis for the
+        # second time, and is then cached for all subsequent resizes.
+        #
+        # The cache is keyed on the identity of the weights array, which is read-only
+        # and therefore cannot be modified in place through this matrix.
+
+        weights = self.weights[axis]
+        if weights is None:
+            return None
+
+        cached = self._weights_order[axis]
+        if cached is None or cached[0] is not weights:
+            self._weights_order[axis] = (weights, None)
+            return None
+
+        weights_order = cached[1]
+        if weights_order is None:
+            # sort in single precision if no information is lost, e.g., for weights
+            # derived from counts, to reduce the memory traffic of the sort
+            weights_to_sort = weights
+            if weights.dtype.itemsize > 4:
+                weights_float32 = weights.astype(np.float32)
+                if np.array_equal(weights_float32, weights):
+                    weights_to_sort = weights_float32
+
+            weights_order = np.argsort(-weights_to_sort, kind="stable")
+            self._weights_order[axis] = (weights, weights_order)
+
+        return weights_order
+
     def to_expression(self) -> Expression:
         """[see superclass]"""
         return Id(type(self))(
@@ -312,17 +379,45 @@ class Matrix(HasExpressionRepr, Generic[T_Number]):
         if not isinstance(other, Matrix):
             raise TypeError
         else:
+            # compare labels and shapes first, before comparing array contents
             return (
-                np.array_equal(self.values, other.values)
+                self.name_labels == other.name_labels
+                and self.value_label == other.value_label
+                and self.values.shape == other.values.shape
+                and np.array_equal(self.values, other.values)
                 and _arrays_equal_or_none(self.weights[0], other.weights[0])
                 and _arrays_equal_or_none(self.weights[1], other.weights[1])
                 and _arrays_equal_or_none(self.names[0], other.names[0])
                 and _arrays_equal_or_none(self.names[1], other.names[1])
-                and self.name_labels == other.name_labels
-                and self.value_label == other.value_label
             )
 
 
+def _validate_pair(arg: Optional[Tuple[Any, ...]], arg_name: str) -> None:
+    # ensure the given optional arg is a 2-tuple
+    if arg is None:
+        return
+    if not isinstance(arg, tuple):
+        raise TypeError(
+            f"arg {arg_name} expected to be tuple, but got a {type(arg).__name__}"
+        )
+    if len(arg) != 2:
+        raise ValueError(
+            f"optional arg {arg_name} expected to be 2-tuple, "
+            f"but got a {len(arg)}-tuple"
+        )
+
+
+def _read_only(
+    arr: Optional[npt.NDArray[T_Number]],
+) -> Optional[npt.NDArray[T_Number]]:
+    # get a read-only view of the given array, leaving the array itself writable
+    if arr is None:
+        return None
+    view = arr.view()
+    view.setflags(write=False)
+    return view
+
+
 def _validate_resize_arg(
     size_new: Union[int, float, None], size_current: int, axis_name: str
 ) -> Tuple[Optional[int], Optional[float]]:
@@ -355,32 +450,69 @@ def _validate_resize_arg(
     return result
 
 
-def _top_items_mask(
+def _is_full_size(
+    target_size: Tuple[Optional[int], Optional[float]], current_size: int
+) -> bool:
+    # check if resizing to the given target size retains all items, without looking
+    # at the weights; a target ratio, even 1.0, may be reached with fewer items since
+    # small weights can vanish in the rounding of the cumulative weight
+    target_n, _ = target_size
+    return target_n == current_size
+
+
+def _top_items_indices(
     weights: Optional[npt.NDArray[np.float_]],
     current_size: int,
     target_size: Tuple[Optional[int], Optional[float]],
-) -> npt.NDArray[np.bool_]:
+    weights_order: Optional[npt.NDArray[np.intp]] = None,
+) -> npt.NDArray[np.intp]:
+    # Get the indices of the items to keep, in ascending order.
+    #
+    # weights_order: the descending stable order of the weights, if known
+
     target_n, target_ratio = target_size
 
     if target_n:
-        if current_size == target_n:
-            return np.ones(current_size, dtype=bool)
-        elif weights is None:
-            mask = np.ones(current_size, dtype=bool)
-            mask[target_n:] = False
-            return mask
+        if current_size == target_n or weights is None:
+            return np.arange(target_n)
 
     elif not target_ratio:
         assert target_ratio, "one of target size or target ratio is defined"
 
     assert weights is not None, "weights are defined"
-    mask = np.zeros(current_size, dtype=bool)
-    ix_weights_descending_stable = (current_size - 1) - weights[::-1].argsort(
-        kind="stable"
-    )[::-1]
-    if target_n:
+
+    # if the weights are already in descending order, e.g., for matrices derived from
+    # sorted data, the descending stable order of the weights is the original order
+    # and there is no need to sort the weights
+    weights_sorted_descending = weights_order is None and bool(
+        (weights[:-1] >= weights[1:]).all()
+    )
+
+    if weights_order is not None or weights_sorted_descending:
+        if not target_n:
+            # pick the minimum number of items reaching the target weight
+            weights_sorted_cumsum = (
+                weights if weights_order is None else weights[weights_order]
+            ).cumsum(dtype=np.float64)
+            target_n = int(
+                weights_sorted_cumsum.searchsorted(
+                    weights_sorted_cumsum[-1] * target_ratio
+                )
+                + 1
+            )
+
         # pick the top n items with the highest weight
-        mask[ix_weights_descending_stable[:target_n]] = True
+        if weights_order is None:
+            return np.arange(target_n)
+        else:
+            return np.sort(weights_order[:target_n])
+
+    if target_n:
+        # pick the top n items with the highest weight, using a partial sort to
+        # determine the n-th highest weight without sorting all weights
+        weight_threshold = np.partition(weights, current_size - target_n)[
+            current_size - target_n
+        ]
 
     else:
         # In descending order of item weight, pick the minimum set of items whose
@@ -389,37 +521,145 @@ def _top_items_mask(
         # THe target weight is expressed as a ratio of total weight
         # (0 < target_ratio <= 1).
 
-        weights_sorted_cumsum: npt.NDArray[np.float_] = weights[
-            ix_weights_descending_stable
-        ].cumsum()
-        mask[
-            : weights_sorted_cumsum.searchsorted(
-                weights_sorted_cumsum[-1] * target_ratio
-            )
-            + 1
-        ] = True
-        mask[ix_weights_descending_stable] = mask.copy()
+        assert target_ratio is not None, "target ratio is defined"
+
+        weight_threshold, target_n = _weight_threshold_for_ratio(
+            weights=weights, target_ratio=target_ratio
+        )
 
+    return np.flatnonzero(
+        _top_items_mask_for_threshold(
+            weights=weights, weight_threshold=weight_threshold, target_n=target_n
+        )
+    )
+
+
+def _top_items_mask_for_threshold(
+    weights: npt.NDArray[np.float_], weight_threshold: float, target_n: int
+) -> npt.NDArray[np.bool_]:
+    # pick all items with a weight greater than the threshold weight, then fill the
+    # remaining slots with the topmost items having exactly the threshold weight
+    mask = weights > weight_threshold
+    n_missing = target_n - np.count_nonzero(mask)
+    mask[np.flatnonzero(weights == weight_threshold)[:n_missing]] = True
     return mask
 
 
-def _resize_rows(
+def _weight_threshold_for_ratio(
+    weights: npt.NDArray[np.float_], target_ratio: float
+) -> Tuple[float, int]:
+    # In descending order of item weight, determine the minimum number of items
+    # whose total weight is equal to or greater than the given ratio of the total
+    # weight, along with the weight of the last of these items.
+    #
+    # The cumulative weights are accumulated in the same order and precision as for
+    # a cached weight order, so that both yield the same items; items with the same
+    # weight are interchangeable here, so sorting the weights themselves suffices.
+
+    n_weights = len(weights)
+
+    if n_weights > _WEIGHT_SORT_MAX_SIZE:
+        # For large numbers of weights, we only sort the highest weights, those
+        # at or above a candidate threshold estimated from a sample of the weights.
+        #
+        # The total weight accumulated in sorted order is then unknown, so we use
+        # the sum of the unsorted weights instead, and bound the target weight by the
+        # maximum rounding error of either sum: both deviate from the exact total
+        # weight by less than n * eps / 2 relative to the total, and we double this
+        # bound to cover the rounding of the target weight. Only if a cumulative
+        # weight falls within these bounds, rounding decides which items to select,
+        # and we sort all weights after all.
+
+        tolerance = 2 * n_weights * float(np.finfo(np.float64).eps)
+        target_weight = weights.sum(dtype=np.float64) * target_ratio
+        target_weight_min = target_weight * (1.0 - tolerance)
+        target_weight_max = target_weight * (1.0 + tolerance)
+
+        candidate_threshold = _candidate_weight_threshold(
+            weights=weights, target_ratio=target_ratio
+        )
+
+        if candidate_threshold is not None:
+            candidates_sorted = np.sort(weights[weights >= candidate_threshold])[::-1]
+            candidates_cumsum = candidates_sorted.cumsum(dtype=np.float64)
+            ix_last = int(candidates_cumsum.searchsorted(target_weight_min))
+            if ix_last < len(candidates_sorted) and ix_last == int(
+                candidates_cumsum.searchsorted(target_weight_max)
+            ):
+                # all target weights within the bounds select the same items
+                return candidates_sorted[ix_last], ix_last + 1
+
+    weights_sorted = np.sort(weights)[::-1]
+    weights_sorted_cumsum = weights_sorted.cumsum(dtype=np.float64)
+    ix_last = int(
+        weights_sorted_cumsum.searchsorted(weights_sorted_cumsum[-1] * target_ratio)
+    )
+    return weights_sorted[ix_last], ix_last + 1
+
+
+def _candidate_weight_threshold(
+    weights: npt.NDArray[np.float_], target_ratio: float
+) -> Optional[float]:
+    # Estimate a weight such that the items at or above this weight are likely to
+    # reach the target ratio of the total weight, based on an evenly spaced sample
+    # of the weights; the estimate includes a margin for sampling errors.
+    #
+    # Return None if the estimate includes more than a third of the items; sorting
+    # all weights is then cheaper than selecting candidates first.
+
+    sample_sorted = np.sort(weights[:: len(weights) // _WEIGHT_SORT_MAX_SIZE])[::-1]
+    sample_cumsum = sample_sorted.cumsum(dtype=np.float64)
+    ix_sample = int(
+        sample_cumsum.searchsorted(
+            sample_cumsum[-1] * min(target_ratio * 1.05 + 0.01, 1.0)
+        )
+    )
+    if ix_sample >= len(sample_sorted) // 3:
+        return None
+    return float(sample_sorted[ix_sample])
+
+
+def _resize_axis(
     values: npt.NDArray[T_Number],
     weights: Optional[npt.NDArray[np.float_]],
+    weights_order: Optional[npt.NDArray[np.intp]],
     names: Optional[npt.NDArray[Any]],
-    current_size: int,
-    target_size: Tuple[Optional[int], Optional[float]],
+    size: Union[int, float, None],
+    axis: int,
+    axis_name: str,
 ) -> Tuple[
     npt.NDArray[T_Number], Optional[npt.NDArray[np.float_]], Optional[npt.NDArray[Any]]
 ]:
-    mask = _top_items_mask(
-        weights=weights, current_size=current_size, target_size=target_size
+    # resize the values, weights, and names along the given axis of the values
+
+    if not size:
+        return values, weights, names
+
+    current_size = values.shape[axis]
+    target_size = _validate_resize_arg(size, current_size, axis_name)
+
+    if _is_full_size(target_size, current_size):
+        return values, weights, names
+
+    # select items by their integer indices for all arrays along the axis;
+    # taking along the axis keeps the values in their original memory order, so
+    # there is no need to transpose the values when resizing columns
+    ix = _top_items_indices(
+        weights=weights,
+        current_size=current_size,
+        target_size=target_size,
+        weights_order=weights_order,
     )
 
+    if len(ix) == current_size:
+        # all items are selected, e.g., if even the items with the lowest weight are
+        # needed to reach the target ratio: return the original arrays, not copies
+        return values, weights, names
+
     return (
-        values[mask],
-        None if weights is None else weights[mask],
-        None if names is None else names[mask],
+        np.take(values, ix, axis=axis),
+        None if weights is None else weights[ix],
+        None if names is None else names[ix],
     )
 
 
@@ -430,6 +670,17 @@ def _arrays_equal_or_none(
         return b is None
     elif b is None:
         return False
+    elif a is b:
+        return True
+    elif a.shape != b.shape:
+        return False
+    elif (
+        a.dtype == b.dtype
+        and a.strides == b.strides
+        and a.__array_interface__["data"][0] == b.__array_interface__["data"][0]
+    ):
+        # both arrays are views of the same memory with the same layout
+        return True
     else:
         return np.array_equal(a, b)
 
@@ -1,9 +1,11 @@
 """
 Utilities for creating simulated data sets.
 """
-from typing import Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from scipy.linalg import toeplitz
 
@@ -30,7 +32,7 @@ def sim_data(
     bin_coef: float = 0,
     outcome: str = "classification",
     regression_err: Optional[float] = None,
-    seed_val: int = 4763546,
+    seed_val: Union[int, np.random.SeedSequence, np.random.Generator] = 4763546,
 ) -> pd.DataFrame:
     """
     Simulate data for classification or regression that includes an interaction between
@@ -78,152 +80,268 @@ def sim_data(
     :param outcome: can be either classification for a binary outcome or regression
         for a continuous outcome
     :param regression_err: the error to be used in simulating a regression outcome
-    :param seed_val: set a seed for reproducibility
+    :param seed_val: a seed for reproducibility; either an integer, a
+        :class:`~numpy.random.SeedSequence`, or a :class:`~numpy.random.Generator`
+        to draw from directly; to simulate multiple independent data sets in
+        parallel, pass each call its own child of ``SeedSequence(seed).spawn(k)``
     :return: data frame containing the simulated features and target for classification
     """
 
-    # set seed
-    np.random.seed(seed=seed_val)
+    # use a local random generator, leaving numpy's global random state untouched;
+    # integer seeds are expanded through a SeedSequence, and generators are used as-is
+    rng = np.random.default_rng(seed_val)
+
+    # determine the feature columns up front, in the order of the resulting data frame
+    n_linear = max(linear_vars, 0)
+    n_noise = max(noise_vars, 0)
+    n_corr = max(corr_vars, 0)
+
+    lin_cols = _feature_names("Linear", n_linear)
+    noise_cols = _feature_names("Noise", n_noise)
+    corr_cols = _feature_names("Corr", n_corr)
+
+    feature_cols = [
+        "TwoFactor1",
+        "TwoFactor2",
+        *lin_cols,
+        "Nonlinear1",
+        "Nonlinear2",
+        "Nonlinear3",
+        *noise_cols,
+        *corr_cols,
+    ]
+    if n_linear:
+        feature_cols.append("Linear1_prime")
+
+    # start indices of the feature blocks in the feature buffer
+    ix_linear = 2
+    ix_nonlinear = ix_linear + n_linear
+    ix_noise = ix_nonlinear + 3
+    ix_corr = ix_noise + n_noise
+
+    # write all features into a single column-major buffer, which pandas can wrap as
+    # a single block without copying or concatenating separate blocks
+    features = np.empty((n, len(feature_cols)), order="F")
+
+    # draw the independent standard normal samples for the two-factor, linear, and
+    # noise features in a single call; we draw one row per feature so that each
+    # feature is contiguous, matching the column-major feature buffer
+    normal = rng.standard_normal(size=(ix_nonlinear + n_noise, n))
 
     # add two correlated normal features for use in creating an interaction term in the
-    # linear predictor
+    # linear predictor, transforming independent samples with the Cholesky factor of
+    # their covariance matrix
     sigma = np.array([[2, 1.3], [1.3, 2]])
-    mu = [0, 0]
-    tmp_data = pd.DataFrame(
-        np.random.multivariate_normal(mu, sigma, size=n),
-        columns=["TwoFactor1", "TwoFactor2"],
-    )
+    features.T[:ix_linear] = np.linalg.cholesky(sigma) @ normal[:ix_linear]
 
     # add independent linear features that contribute to the linear predictor
-    if linear_vars > 0:
-        lin_cols = ["Linear" + str(x) for x in range(1, linear_vars + 1)]
-        tmp_data = pd.concat(
-            [
-                tmp_data,
-                pd.DataFrame(np.random.normal(size=(n, linear_vars)), columns=lin_cols),
-            ],
-            axis=1,
-        )
-    else:
-        lin_cols = None
+    features.T[ix_linear:ix_nonlinear] = normal[ix_linear:ix_nonlinear]
 
     # add non-linear features that contribute to the linear predictor
-    tmp_data["Nonlinear1"] = pd.Series(np.random.uniform(low=-1.0, high=1.0, size=n))
-    tmp_data = pd.concat(
-        [
-            tmp_data,
-            pd.DataFrame(
-                np.random.uniform(size=(n, 2)), columns=["Nonlinear2", "Nonlinear3"]
-            ),
-        ],
-        axis=1,
-    )
+    features[:, ix_nonlinear] = rng.uniform(low=-1.0, high=1.0, size=n)
+    features[:, ix_nonlinear + 1 : ix_noise] = rng.uniform(size=(n, 2))
 
     # add independent noise features that do not contribute to the linear predictor
-    if noise_vars > 0:
-        noise_cols = ["Noise" + str(x) for x in range(1, noise_vars + 1)]
-        tmp_data = pd.concat(
-            [
-                tmp_data,
-                pd.DataFrame(
-                    np.random.normal(size=(n, noise_vars)), columns=noise_cols
-                ),
-            ],
-            axis=1,
-        )
-
-    # add correlated noise features that do not contribute to the linear predictor
-    if corr_vars > 0:
-        if corr_type == "exch":
-            vc = corr_value * np.ones((corr_vars, corr_vars))
-            np.fill_diagonal(vc, 1)
+    features.T[ix_noise:ix_corr] = normal[ix_nonlinear:]
 
-        elif corr_type == "AR1":
-            vc_values = corr_value ** np.arange(corr_vars)
-            vc = toeplitz(vc_values)
+    # release the samples before drawing further features, to reduce peak memory
+    del normal
 
-        else:
-            raise ValueError(
-                f'arg corr_type must be "exch" or "AR1", but got {repr(corr_type)}'
-            )
-
-        corr_cols = ["Corr" + str(x) for x in range(1, corr_vars + 1)]
-        tmp_data = pd.concat(
-            [
-                tmp_data,
-                pd.DataFrame(
-                    np.random.multivariate_normal(np.zeros(corr_vars), vc, size=n),
-                    columns=corr_cols,
-                ),
-            ],
-            axis=1,
+    # add correlated noise features that do not contribute to the linear predictor
+    if n_corr:
+        features[:, ix_corr : ix_corr + n_corr] = _correlated_normal(
+            rng,
+            corr_type=corr_type,
+            corr_value=corr_value,
+            n_vars=n_corr,
+            size=n,
         )
 
     # add a surrogate linear feature that does not contribute to the linear predictor
-    if linear_vars > 0:
-        tmp_data["Linear1_prime"] = tmp_data["Linear1"] + np.random.normal(
-            0, surg_err, size=n
-        )
+    if n_linear:
+        features[:, -1] = features[:, ix_linear] + rng.normal(0, surg_err, size=n)
+
+    tmp_data = pd.DataFrame(features, columns=feature_cols, copy=False)
+
+    # collect the binary features and the target, to be added to the data frame in a
+    # single step since their dtypes differ from the float features
+    other_columns: Dict[str, npt.NDArray[Any]] = {}
 
     # add a binary feature that contributes to the linear predictor
     if bin_var_p > 0:
-        tmp_data["Binary1"] = np.where(np.random.uniform(size=n) <= bin_var_p, 0, 1)
+        # reinterpret the boolean outcomes as 0/1 integers, without copying
+        binary_1 = (rng.random(size=n) > bin_var_p).view(np.uint8)
+        other_columns["Binary1"] = binary_1
 
     # generate linear predictor
     if two_way_coef is None:
         two_way_coef = (4.0, 4.0, 2.0)
 
-    lp = (
-        intercept
-        - two_way_coef[0] * tmp_data.TwoFactor1
-        + two_way_coef[1] * tmp_data.TwoFactor2
-        + two_way_coef[2] * tmp_data.TwoFactor1 * tmp_data.TwoFactor2
-        + tmp_data.Nonlinear1**3
-        + 2 * np.exp(-6 * (tmp_data.Nonlinear1 - 0.3) ** 2)
-        + 2 * np.sin(np.pi * tmp_data.Nonlinear2 * tmp_data.Nonlinear3)
-    )
+    # read the features from the feature buffer, rather than from the data frame
+    two_factor_1 = features[:, 0]
+    two_factor_2 = features[:, 1]
+    nonlinear_1 = features[:, ix_nonlinear]
+    nonlinear_2 = features[:, ix_nonlinear + 1]
+    nonlinear_3 = features[:, ix_nonlinear + 2]
+
+    # accumulate the terms of the linear predictor in place, reusing a single buffer
+    # for intermediate results instead of allocating a new array for every operation
+    lp = np.full(n, float(intercept))
+    term = np.empty(n)
+
+    if two_way_coef[0] == two_way_coef[1]:
+        # both linear terms have the same coefficient (as with the defaults), so we
+        # only need to scale the difference of the two factors
+        np.subtract(two_factor_2, two_factor_1, out=term)
+        term *= two_way_coef[1]
+        lp += term
+    else:
+        np.multiply(two_factor_1, -two_way_coef[0], out=term)
+        lp += term
+        np.multiply(two_factor_2, two_way_coef[1], out=term)
+        lp += term
+    np.multiply(two_factor_1, two_way_coef[2], out=term)
+    term *= two_factor_2
+    lp += term
+
+    np.power(nonlinear_1, 3, out=term)
+    lp += term
+    np.subtract(nonlinear_1, 0.3, out=term)
+    np.square(term, out=term)
+    term *= -6
+    np.exp(term, out=term)
+    term *= 2
+    lp += term
+    np.multiply(nonlinear_2, np.pi, out=term)
+    term *= nonlinear_3
+    np.sin(term, out=term)
+    term *= 2
+    lp += term
+    del term
 
     # add independent linear features to the linear predictor if required
-    if linear_vars > 0:
+    if n_linear:
         if linear_var_coef is None:
-            lin_coef = np.linspace(linear_vars, 1, num=linear_vars) / 4
-            neg_idx = list(range(1, linear_vars, 2))
-            lin_coef[neg_idx] *= -1
-            lp += tmp_data[lin_cols].dot(lin_coef)
+            # coefficients decreasing from linear_vars/4 to 1/4, with alternating signs
+            lin_coef = np.arange(linear_vars, 0, -1, dtype=np.float64) / 4
+            lin_coef[1::2] *= -1
 
-        elif linear_var_coef is not None:
+        else:
             if linear_vars != len(linear_var_coef):
                 raise ValueError(
                     "User defined linear feature coefficient list must be of length "
                     f"{linear_vars}"
                 )
-            lp += tmp_data[lin_cols].dot(linear_var_coef)
+            lin_coef = np.asarray(linear_var_coef, dtype=np.float64)
+
+        # multiply the linear features in the feature buffer with their coefficients,
+        # without selecting columns from the data frame
+        lp += features[:, ix_linear:ix_nonlinear] @ lin_coef
 
     # add binary feature to the linear predictor if required
     if bin_var_p > 0:
-        lp += bin_coef * tmp_data["Binary1"]
-        tmp_data["Binary1_prime"] = 1 - tmp_data["Binary1"]
+        lp += bin_coef * binary_1
+        other_columns["Binary1_prime"] = binary_1 ^ 1
 
     # create classification outcome from linear predictor
     if outcome == "classification":
-
-        # convert to a probability
-        prob = 1 / (1 + np.exp(-lp))
-
-        # generate target
-        tmp_data["target"] = np.where(prob <= np.random.uniform(size=n), 0, 1)
+        # convert to a probability; single precision is ample for sampling the target
+        # and speeds up the exponential, which saturates to a probability of 0 for
+        # very low values of the linear predictor
+        with np.errstate(over="ignore"):
+            prob = 1 / (1 + np.exp(-lp.astype(np.float32)))
+
+        # generate target as a Bernoulli trial with the given probability
+        other_columns["target"] = (rng.random(size=n, dtype=np.float32) < prob).astype(
+            np.int8
+        )
+        del prob
 
     # create regression outcome
     elif outcome == "regression":
-
         # continuous outcome based on linear predictor
-        tmp_data["target"] = (
-            np.random.normal(lp, size=n)
+        other_columns["target"] = (
+            rng.normal(lp, size=n)
             if regression_err is None
-            else np.random.normal(lp, regression_err, size=n)
+            else rng.normal(lp, regression_err, size=n)
         )
 
-    return tmp_data
+    if not other_columns:
+        return tmp_data
+
+    # add the remaining columns without copying the float features
+    return pd.concat(
+        [tmp_data, pd.DataFrame(other_columns, copy=False)], axis=1, copy=False
+    )
+
+
+@lru_cache(maxsize=64)
+def _feature_names(prefix: str, n_features: int) -> Tuple[str, ...]:
+    # Get the names of the given number of features, numbered from 1 and prefixed
+    # with the given string. Names are cached for repeated simulations of the same
+    # shape.
+    return tuple(f"{prefix}{i}" for i in range(1, n_features + 1))
+
+
+def _correlated_normal(
+    rng: np.random.Generator,
+    corr_type: str,
+    corr_value: float,
+    n_vars: int,
+    size: int,
+) -> npt.NDArray[np.float_]:
+    # Sample standard normal features with exchangeable or auto-regressive
+    # correlation. Both correlation structures can be sampled directly, without
+    # constructing and factorizing the covariance matrix. For correlation values
+    # outside the range supported by the direct construction, sample from the
+    # covariance matrix instead.
+
+    if corr_type == "exch":
+        if 0 <= corr_value <= 1:
+            # all features share a common factor, with weight sqrt(corr_value)
+            samples = rng.standard_normal(size=(size, n_vars))
+            samples *= np.sqrt(1 - corr_value)
+            samples += np.sqrt(corr_value) * rng.standard_normal(size=(size, 1))
+            return samples
+
+        vc = corr_value * np.ones((n_vars, n_vars))
+        np.fill_diagonal(vc, 1)
+
+    elif corr_type == "AR1":
+        if -1 <= corr_value <= 1:
+            # each feature is the previous feature, scaled by corr_value, plus
+            # independent noise; we sample by feature so that each feature is
+            # contiguous in memory
+            samples = rng.standard_normal(size=(n_vars, size))
+            samples[1:] *= np.sqrt(1 - corr_value**2)
+            for i in range(1, n_vars):
+                samples[i] += corr_value * samples[i - 1]
+            return samples.T
+
+        vc = toeplitz(corr_value ** np.arange(n_vars))
+
+    else:
+        raise ValueError(
+            f'arg corr_type must be "exch" or "AR1", but got {repr(corr_type)}'
+        )
+
+    return _multivariate_normal(rng, vc, size=size)
+
+
+def _multivariate_normal(
+    rng: np.random.Generator, cov: npt.NDArray[np.float_], size: int
+) -> npt.NDArray[np.float_]:
+    # Sample from a zero-mean multivariate normal distribution, transforming
+    # independent standard normal samples with the Cholesky factor of the covariance
+    # matrix; this is considerably faster than the SVD used by default in
+    # Generator.multivariate_normal, which we still need for singular covariance
+    # matrices (e.g., perfectly correlated features)
+    try:
+        cov_cholesky = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        return rng.multivariate_normal(np.zeros(len(cov)), cov, size=size)
+
+    return rng.standard_normal(size=(size, len(cov))) @ cov_cholesky.T
 
 
 __tracker.validate()
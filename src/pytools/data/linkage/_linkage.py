@@ -4,7 +4,7 @@ Supporting classes for linkage trees.
 
 import logging
 from abc import ABCMeta, abstractmethod
-from typing import cast
+from typing import Optional, cast
 
 from pytools.api import AllTracker, inheritdoc
 from pytools.expression import Expression, HasExpressionRepr
@@ -36,11 +36,17 @@ class Node(HasExpressionRepr, metaclass=ABCMeta):
     Base class for nodes of a :class:`.LinkageTree`.
     """
 
+    __slots__ = ("_index", "_expression")
+
+    # the expression representing this node, created on first use
+    _expression: Optional[Expression]
+
     def __init__(self, index: int) -> None:
         """
         :param index: the numerical index of this node in the linkage tree
         """
         self._index = index
+        self._expression = None
 
     @property
     def index(self) -> int:
@@ -91,6 +97,8 @@ class LinkageNode(Node):
     An inner node in a :class:`.LinkageTree`.
     """
 
+    __slots__ = ("_children_distance",)
+
     def __init__(self, index: int, children_distance: float) -> None:
         """
         :param children_distance: the distance between this node and its children
@@ -119,14 +127,19 @@ class LinkageNode(Node):
         """
         raise self._type_error("name")
 
-    @property
-    def is_leaf(self) -> bool:
-        """``False``"""
-        return False
+    #: ``False``; a class attribute rather than a property, for fast lookup during
+    #: tree traversal
+    is_leaf = False
 
     def to_expression(self) -> Expression:
         """[see superclass]"""
-        return Id(type(self))(self.index, children_distance=self.children_distance)
+        # nodes are immutable, so we only need to create the expression once
+        expression = self._expression
+        if expression is None:
+            self._expression = expression = Id(type(self))(
+                self.index, children_distance=self.children_distance
+            )
+        return expression
 
 
 @inheritdoc(match="""[see superclass]""")
@@ -135,6 +148,8 @@ class LeafNode(Node):
     A leaf in a :class:`.LinkageTree`.
     """
 
+    __slots__ = ("_name", "_weight")
+
     def __init__(self, index: int, name: str, weight: float) -> None:
         """
         :param name: the name of the leaf
@@ -163,14 +178,19 @@ class LeafNode(Node):
         """[see superclass]"""
         return self._weight
 
-    @property
-    def is_leaf(self) -> bool:
-        """``True``"""
-        return True
+    #: ``True``; a class attribute rather than a property, for fast lookup during
+    #: tree traversal
+    is_leaf = True
 
     def to_expression(self) -> Expression:
         """[see superclass]"""
-        return Id(type(self))(self.index, name=self.name, weight=self.weight)
+        # nodes are immutable, so we only need to create the expression once
+        expression = self._expression
+        if expression is None:
+            self._expression = expression = Id(type(self))(
+                self.index, name=self.name, weight=self.weight
+            )
+        return expression
 
 
 __tracker.validate()
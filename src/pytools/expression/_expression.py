@@ -5,12 +5,24 @@ from __future__ import annotations
 
 import logging
 from abc import ABCMeta, abstractmethod
-from typing import Any, Dict, Optional, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    cast,
+)
 
 import numpy as np
 import numpy.typing as npt
 
-from ..api import AllTracker, inheritdoc, to_list
+from ..api import AllTracker, deprecation_warning, inheritdoc, to_list
 from .operator import BinaryOperator, UnaryOperator
 
 log = logging.getLogger(__name__)
@@ -77,9 +89,16 @@ class ExpressionFormatter(metaclass=ABCMeta):
         :return: a :class:`.PythonExpressionFormatter` with default parameters for all
             formatting settings except for ``single_line``
         """
-        from .formatter import PythonExpressionFormatter
+        # default formatters are stateless, so we create each of them only once
+        single_line = bool(single_line)
+        formatter = _DEFAULT_FORMATTERS.get(single_line, None)
+        if formatter is None:
+            from .formatter import PythonExpressionFormatter
 
-        return PythonExpressionFormatter(single_line=single_line)
+            _DEFAULT_FORMATTERS[single_line] = formatter = PythonExpressionFormatter(
+                single_line=single_line
+            )
+        return formatter
 
 
 class HasExpressionRepr(metaclass=ABCMeta):
@@ -88,6 +107,8 @@ class HasExpressionRepr(metaclass=ABCMeta):
     representations using expression objects.
     """
 
+    __slots__ = ()
+
     @abstractmethod
     def to_expression(self) -> Expression:
         """
@@ -121,12 +142,79 @@ class HasExpressionRepr(metaclass=ABCMeta):
         }
 
 
+# factories for the operator methods of class Expression; we create the methods with
+# closures over their operators rather than defining each method by hand
+
+_BinaryOperatorMethod = Callable[["Expression", Any], "Expression"]
+
+
+def _binary_operator_method(operator: BinaryOperator) -> _BinaryOperatorMethod:
+    def _method(self: Expression, other: Any) -> Expression:
+        return _binary_operation(operator, self, other)
+
+    return _method
+
+
+def _reflected_operator_method(operator: BinaryOperator) -> _BinaryOperatorMethod:
+    def _method(self: Expression, other: Any) -> Expression:
+        return _binary_operation(operator, other, self)
+
+    return _method
+
+
+def _unary_operator_method(
+    operator: UnaryOperator,
+) -> Callable[[Expression], Expression]:
+    def _method(self: Expression) -> Expression:
+        return _unary_operation(operator, self)
+
+    return _method
+
+
 @inheritdoc(match="[see superclass]")
 class Expression(HasExpressionRepr, metaclass=ABCMeta):
     """
     A representation of an expression.
     """
 
+    # subclasses declare slots for their fields, so expressions have no __dict__;
+    # subclasses needing weak references declare slot __weakref__
+    __slots__ = ("_hash",)
+
+    # the cached hash code of this expression; only set for expressions that cannot
+    # change, i.e., that do not contain an ExpressionAlias
+    _hash: Optional[int]
+
+    def __new__(cls: Type[T], *args: Any, **kwargs: Any) -> T:
+        # we initialize the cached hash code when creating the expression rather than
+        # in __init__, so that subclasses need not call Expression.__init__
+        expression = object.__new__(cls)
+        object.__setattr__(expression, "_hash", None)
+        return expression
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+
+        # subclasses written for pytools 2.1.2 and earlier implement the hash code and
+        # equality of an expression including its subexpressions, in methods hash_
+        # and _eq_same_type; we adapt these to the node-wise methods used instead
+        namespace = cls.__dict__
+        if "hash_" in namespace and "_hash_node" not in namespace:
+            deprecation_warning(
+                f"{cls.__qualname__} overrides method hash_; implement method "
+                "_hash_node instead",
+                stacklevel=3,
+            )
+            setattr(cls, "_hash_node", _legacy_hash_node)
+        if "_eq_same_type" in namespace and "_eq_node" not in namespace:
+            deprecation_warning(
+                f"{cls.__qualname__} implements method _eq_same_type; implement "
+                "method _eq_node instead",
+                stacklevel=3,
+            )
+            setattr(cls, "_eq_node", _legacy_eq_node)
+            setattr(cls, "_eq_subexpressions", _legacy_eq_subexpressions)
+
     @property
     @abstractmethod
     def precedence_(self) -> int:
@@ -149,9 +237,7 @@ class Expression(HasExpressionRepr, metaclass=ABCMeta):
         :param other: other operand to combine with this expression using a logical `or`
         :return: the logical `or` expression
         """
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.OR, self, other)
+        return _binary_operation(BinaryOperator.OR, self, other)
 
     def and_(self, other: Expression) -> Expression:
         """
@@ -161,9 +247,7 @@ class Expression(HasExpressionRepr, metaclass=ABCMeta):
             `and`
         :return: the logical `and` expression
         """
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.AND, self, other)
+        return _binary_operation(BinaryOperator.AND, self, other)
 
     def not_(self) -> Expression:
         """
@@ -171,9 +255,7 @@ class Expression(HasExpressionRepr, metaclass=ABCMeta):
 
         :return: the logical `not` expression
         """
-        from .composite import UnaryOperation
-
-        return UnaryOperation(UnaryOperator.NOT, self)
+        return _unary_operation(UnaryOperator.NOT, self)
 
     def eq_(self, other: Expression) -> bool:
         """
@@ -185,18 +267,65 @@ class Expression(HasExpressionRepr, metaclass=ABCMeta):
         :param other: the expression to compare this expression with
         :return: ``True`` if both expressions are equal; ``False`` otherwise
         """
-        self_type = type(self)
-        other_type = type(other)
+        # We compare both expression trees in lockstep, depth-first and from left to
+        # right, using an explicit stack of pairs of subexpressions still to be
+        # compared. This way, deeply nested expressions do not exceed the recursion
+        # limit, and we stop at the first pair of subexpressions that differ.
+
+        stack: List[Tuple[Expression, Expression]] = [(self, other)]
+
+        while stack:
+            expression, other = stack.pop()
+
+            if expression is other:
+                # identical expressions are always equal, e.g., interned identifiers
+                # and literals, or subexpressions shared by both expressions
+                continue
+
+            expression_type = type(expression)
+            other_type = type(other)
+
+            if expression_type is ExpressionAlias or other_type is ExpressionAlias:
+                # resolve aliases, including chains of aliases, to the expressions
+                # they currently represent; we do not cache the resolved expressions
+                # since aliases can be redirected at any time
+                while expression_type is ExpressionAlias:
+                    expression = cast(ExpressionAlias, expression).expression_
+                    expression_type = type(expression)
+                while other_type is ExpressionAlias:
+                    other = cast(ExpressionAlias, other).expression_
+                    other_type = type(other)
+                if expression is other:
+                    continue
+
+            if expression_type is not other_type:
+                return False
+
+            # if both hashes are cached, different hashes rule out equality without
+            # comparing the expressions; we do not calculate any missing hashes
+            hash_ = expression._hash
+            if hash_ is not None:
+                other_hash = other._hash
+                if other_hash is not None and hash_ != other_hash:
+                    return False
 
-        if self_type is ExpressionAlias:
-            return other.eq_(self.expression_)
-        elif other_type is ExpressionAlias:
-            return self.eq_(other.expression_)
-        else:
             # noinspection PyProtectedMember
-            return self_type is other_type and self._eq_same_type(other)
+            if not expression._eq_node(other):
+                return False
+
+            # noinspection PyProtectedMember
+            subexpressions = expression._eq_subexpressions()
+            # noinspection PyProtectedMember
+            other_subexpressions = other._eq_subexpressions()
+            if len(subexpressions) != len(other_subexpressions):
+                return False
+
+            # push the pairs of subexpressions in reverse order, so we compare them
+            # from left to right
+            stack.extend(zip(reversed(subexpressions), reversed(other_subexpressions)))
+
+        return True
 
-    @abstractmethod
     def hash_(self) -> int:
         """
         Calculate the hash code for this expression.
@@ -205,197 +334,202 @@ class Expression(HasExpressionRepr, metaclass=ABCMeta):
 
         :return: the hash code for this expression
         """
-        pass
+        if type(self)._hash_node is _legacy_hash_node:
+            # a subclass overriding this method calls it through super(), expecting
+            # the hash code as calculated by its superclass
+            return _legacy_super_hash(self)
 
-    def to_expression(self) -> Expression:
-        """[see superclass]"""
-        return self
+        hash_ = self._hash
+        if hash_ is None:
+            hash_ = self._hash_tree({})
+        return hash_
 
-    @abstractmethod
-    def _eq_same_type(self: T, other: T) -> bool:
-        # assuming other is the same type as self, check if self and other are equal
-        pass
-
-    def __add__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.ADD, self, other)
-
-    def __sub__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.SUB, self, other)
-
-    def __mul__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.MUL, self, other)
-
-    def __matmul__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
+    @staticmethod
+    def hash_many_(expressions: Iterable[Expression]) -> List[int]:
+        """
+        Calculate the hash codes for multiple expressions.
 
-        return BinaryOperation(BinaryOperator.MATMUL, self, other)
+        Returns the same hash codes as calling :meth:`.hash_` on each expression, but
+        hashes subexpressions shared across the given expressions only once.
 
-    def __truediv__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
+        :param expressions: the expressions to hash
+        :return: the hash codes of the given expressions, in the same order
+        """
+        # keep references to all expressions, so that the ids of their subexpressions
+        # remain unique while we hash them
+        expressions = list(expressions)
 
-        return BinaryOperation(BinaryOperator.DIV, self, other)
+        # the hash codes of all expressions hashed so far, keyed by their ids
+        hashes: Dict[int, int] = {}
 
-    def __floordiv__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
+        return [
+            expression._hash_tree(hashes)
+            if expression._hash is None
+            else expression._hash
+            for expression in expressions
+        ]
 
-        return BinaryOperation(BinaryOperator.FLOOR_DIV, self, other)
+    def to_expression(self) -> Expression:
+        """[see superclass]"""
+        return self
 
-    def __mod__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
+    def _eq_node(self: T, other: T) -> bool:
+        # assuming other is the same type as self, check if self and other are equal,
+        # not taking into account their subexpressions
+        #
+        # this method is not abstract, so that subclasses implementing method
+        # _eq_same_type instead can still be instantiated; __init_subclass__ replaces
+        # it for these subclasses
+        raise NotImplementedError(
+            f"{type(self).__qualname__} must implement method _eq_node"
+        )
+
+    def _eq_subexpressions(self) -> Tuple[Expression, ...]:
+        # the subexpressions to compare pairwise with the subexpressions of another
+        # expression of the same type, when comparing both expressions for equality
+        return self.subexpressions_
+
+    def _hash_node(self, subexpression_hashes: List[int]) -> int:
+        # calculate the hash code of this expression, given the hash codes of its
+        # subexpressions in the order of attribute subexpressions_
+        #
+        # this method is not abstract, so that subclasses overriding method hash_
+        # instead can still be instantiated; __init_subclass__ replaces it for these
+        # subclasses
+        raise NotImplementedError(
+            f"{type(self).__qualname__} must implement method _hash_node"
+        )
+
+    def _hash_tree(self, hashes: Dict[int, int]) -> int:
+        # Calculate the hash code of this expression bottom-up.
+        #
+        # We cache the hash codes of all subexpressions that cannot change, i.e., that
+        # do not contain an alias, and do not traverse subexpressions with a cached
+        # hash code. Other subexpressions shared across the expression tree are only
+        # hashed once. We traverse the tree using an explicit stack, so deeply nested
+        # expressions do not exceed the recursion limit.
+        #
+        # Hash codes of the expressions hashed so far are stored in the given dict,
+        # keyed by the ids of the expressions; the dict is updated in place.
+
+        # stack of expressions to visit, with a flag indicating whether all
+        # subexpressions of the expression have already been hashed
+        stack: List[Tuple[Expression, bool]] = [(self, False)]
+
+        while stack:
+            expression, expanded = stack.pop()
+            key = id(expression)
+            if key in hashes:
+                continue
+
+            subexpressions = expression.subexpressions_
+
+            if expanded:
+                hash_ = expression._hash_node(
+                    [hashes[id(subexpression)] for subexpression in subexpressions]
+                )
+                if not isinstance(expression, ExpressionAlias) and None not in [
+                    subexpression._hash for subexpression in subexpressions
+                ]:
+                    # the subexpressions cannot change, so neither can this expression
+                    expression._hash = hash_
+                hashes[key] = hash_
+            elif expression._hash is not None:
+                hashes[key] = expression._hash
+            else:
+                stack.append((expression, True))
+                stack.extend(
+                    (subexpression, False)
+                    for subexpression in subexpressions
+                    if id(subexpression) not in hashes
+                )
+
+        return hashes[id(self)]
+
+    def _post_order(self) -> List[Expression]:
+        # Get this expression and all its distinct subexpressions, ordered such that
+        # every expression comes after all of its subexpressions.
+        #
+        # Subexpressions that are shared across the expression tree are only included
+        # once. We traverse the tree using an explicit stack, so deeply nested
+        # expressions do not exceed the recursion limit.
+
+        post_order: List[Expression] = []
+        visited: Set[int] = set()
+
+        # stack of expressions to visit, with a flag indicating whether all
+        # subexpressions of the expression have already been added to the result
+        stack: List[Tuple[Expression, bool]] = [(self, False)]
+
+        while stack:
+            expression, expanded = stack.pop()
+            if expanded:
+                post_order.append(expression)
+            elif id(expression) not in visited:
+                visited.add(id(expression))
+                stack.append((expression, True))
+                stack.extend(
+                    (subexpression, False)
+                    for subexpression in reversed(expression.subexpressions_)
+                )
+
+        return post_order
+
+    # the operator methods create operation expressions; see the method factories
+    # below the class definition
+
+    __add__ = _binary_operator_method(BinaryOperator.ADD)
+    __sub__ = _binary_operator_method(BinaryOperator.SUB)
+    __mul__ = _binary_operator_method(BinaryOperator.MUL)
+    __matmul__ = _binary_operator_method(BinaryOperator.MATMUL)
+    __truediv__ = _binary_operator_method(BinaryOperator.DIV)
+    __floordiv__ = _binary_operator_method(BinaryOperator.FLOOR_DIV)
+    __mod__ = _binary_operator_method(BinaryOperator.MOD)
+    __lshift__ = _binary_operator_method(BinaryOperator.LSHIFT)
+    __rshift__ = _binary_operator_method(BinaryOperator.RSHIFT)
+    __and__ = _binary_operator_method(BinaryOperator.AND_BITWISE)
+    __xor__ = _binary_operator_method(BinaryOperator.XOR_BITWISE)
+    __or__ = _binary_operator_method(BinaryOperator.OR_BITWISE)
+
+    __radd__ = _reflected_operator_method(BinaryOperator.ADD)
+    __rsub__ = _reflected_operator_method(BinaryOperator.SUB)
+    __rmul__ = _reflected_operator_method(BinaryOperator.MUL)
+    __rmatmul__ = _reflected_operator_method(BinaryOperator.MATMUL)
+    __rtruediv__ = _reflected_operator_method(BinaryOperator.DIV)
+    __rfloordiv__ = _reflected_operator_method(BinaryOperator.FLOOR_DIV)
+    __rmod__ = _reflected_operator_method(BinaryOperator.MOD)
+    __rlshift__ = _reflected_operator_method(BinaryOperator.LSHIFT)
+    __rrshift__ = _reflected_operator_method(BinaryOperator.RSHIFT)
+    __rand__ = _reflected_operator_method(BinaryOperator.AND_BITWISE)
+    __rxor__ = _reflected_operator_method(BinaryOperator.XOR_BITWISE)
+    __ror__ = _reflected_operator_method(BinaryOperator.OR_BITWISE)
+
+    __neg__ = _unary_operator_method(UnaryOperator.NEG)
+    __pos__ = _unary_operator_method(UnaryOperator.POS)
+    __invert__ = _unary_operator_method(UnaryOperator.INVERT)
 
-        return BinaryOperation(BinaryOperator.MOD, self, other)
+    # we are returning an expression, not a bool so we need to disable type checks
+    __eq__: _BinaryOperatorMethod = _binary_operator_method(  # type: ignore
+        BinaryOperator.EQ
+    )
+    __ne__: _BinaryOperatorMethod = _binary_operator_method(  # type: ignore
+        BinaryOperator.NEQ
+    )
+
+    __gt__ = _binary_operator_method(BinaryOperator.GT)
+    __ge__ = _binary_operator_method(BinaryOperator.GE)
+    __lt__ = _binary_operator_method(BinaryOperator.LT)
+    __le__ = _binary_operator_method(BinaryOperator.LE)
 
     def __pow__(self, power: Any, modulo: Any = None) -> Expression:
         if modulo is not None:
             return NotImplemented
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.POW, self, power)
-
-    def __lshift__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.LSHIFT, self, other)
-
-    def __rshift__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.RSHIFT, self, other)
-
-    def __and__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.AND_BITWISE, self, other)
-
-    def __xor__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.XOR_BITWISE, self, other)
-
-    def __or__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.OR_BITWISE, self, other)
-
-    def __radd__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.ADD, other, self)
-
-    def __rsub__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.SUB, other, self)
-
-    def __rmul__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.MUL, other, self)
-
-    def __rmatmul__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.MATMUL, other, self)
-
-    def __rtruediv__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.DIV, other, self)
-
-    def __rfloordiv__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.FLOOR_DIV, other, self)
-
-    def __rmod__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.MOD, other, self)
+        return _binary_operation(BinaryOperator.POW, self, power)
 
     def __rpow__(self, power: Any, modulo: Any = None) -> Expression:
         if modulo is not None:
             return NotImplemented
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.POW, (power, self))
-
-    def __rlshift__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.LSHIFT, other, self)
-
-    def __rrshift__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.RSHIFT, other, self)
-
-    def __rand__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.AND_BITWISE, other, self)
-
-    def __rxor__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.XOR_BITWISE, other, self)
-
-    def __ror__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.OR_BITWISE, other, self)
-
-    def __neg__(self) -> Expression:
-        from .composite import UnaryOperation
-
-        return UnaryOperation(UnaryOperator.NEG, self)
-
-    def __pos__(self) -> Expression:
-        from .composite import UnaryOperation
-
-        return UnaryOperation(UnaryOperator.POS, self)
-
-    def __invert__(self) -> Expression:
-        from .composite import UnaryOperation
-
-        return UnaryOperation(UnaryOperator.INVERT, self)
-
-    # we are returning an expression, not a bool so we need to disable type checks
-    def __eq__(self, other: Any) -> Expression:  # type: ignore
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.EQ, self, other)
-
-    # we are returning an expression, not a bool so we need to disable type checks
-    def __ne__(self, other: Any) -> Expression:  # type: ignore
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.NEQ, self, other)
-
-    def __gt__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.GT, self, other)
-
-    def __ge__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.GE, self, other)
-
-    def __lt__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.LT, self, other)
-
-    def __le__(self, other: Any) -> Expression:
-        from .composite import BinaryOperation
-
-        return BinaryOperation(BinaryOperator.LE, self, other)
+        return _binary_operation(BinaryOperator.POW, power, self)
 
     def __call__(self, *args: Any, **kwargs: Any) -> Expression:
         """
@@ -403,9 +537,7 @@ class Expression(HasExpressionRepr, metaclass=ABCMeta):
 
         :return: the resulting expression
         """
-        from .composite import Call
-
-        return Call(self, *args, **kwargs)
+        return _call(self, *args, **kwargs)
 
     def __getitem__(self, key: Any) -> Expression:
         from .composite import Index
@@ -427,8 +559,10 @@ class Expression(HasExpressionRepr, metaclass=ABCMeta):
             return Attr(obj=self, attribute=key)
 
     def __setattr__(self, key: str, value: Any) -> None:
-        if key.startswith("_") or key.endswith("_"):
-            super().__setattr__(key, value)
+        # this method is called for every field set in a constructor, so we use
+        # slicing rather than the slower str.startswith and str.endswith methods
+        if key[:1] == "_" or key[-1:] == "_":
+            object.__setattr__(self, key, value)
         else:
             raise TypeError(f"cannot set public field of Expression: {key}")
 
@@ -461,11 +595,17 @@ class FrozenExpression(HasExpressionRepr):
     but instead support Python's native semantics for equality and hashing.
     """
 
+    __slots__ = ("_expression", "_repr", "_str")
+
     def __init__(self, expression: Expression) -> None:
         """
         :param expression: the expression to be frozen
         """
         self._expression = expression
+        # the textual representations of the expression, cached on first use unless
+        # the expression contains aliases that could still be changed
+        self._repr: Optional[str] = None
+        self._str: Optional[str] = None
 
     def to_expression(self) -> Expression:
         """
@@ -480,7 +620,54 @@ class FrozenExpression(HasExpressionRepr):
         return type(self) is type(other) and self._expression.eq_(other._expression)
 
     def __hash__(self) -> int:
-        return self._expression.hash_()
+        # we do not cache the hash on this wrapper, as the expression may contain
+        # aliases that could still be changed; instead we read the hash cached by
+        # expressions without aliases directly, saving a method call
+        expression = self._expression
+        # noinspection PyProtectedMember
+        hash_ = expression._hash
+        return expression.hash_() if hash_ is None else hash_
+
+    def __repr__(self) -> str:
+        text = self._repr
+        if text is None:
+            text = repr(self._expression)
+            if self._is_immutable():
+                self._repr = text
+        return text
+
+    def __str__(self) -> str:
+        text = self._str
+        if text is None:
+            text = str(self._expression)
+            if self._is_immutable():
+                self._str = text
+        return text
+
+    def _is_immutable(self) -> bool:
+        # the textual representations of an expression can only change if it contains
+        # an alias; we search for aliases without hashing the expression, as hashing
+        # fails for expressions with unhashable literals
+
+        expression = self._expression
+        # noinspection PyProtectedMember
+        if expression._hash is not None:
+            # expressions only cache their hash if they contain no aliases
+            return True
+
+        # ids of the subexpressions visited so far, to visit shared subexpressions once
+        visited: Set[int] = set()
+        stack: List[Expression] = [expression]
+        while stack:
+            expression = stack.pop()
+            if isinstance(expression, ExpressionAlias):
+                return False
+            key = id(expression)
+            if key not in visited:
+                visited.add(key)
+                stack.extend(expression.subexpressions_)
+
+        return True
 
 
 def make_expression(value: Any) -> Expression:
@@ -504,7 +691,20 @@ def make_expression(value: Any) -> Expression:
     :return: the resulting expression
     """
 
-    if isinstance(value, HasExpressionRepr):
+    # fast path: look up a factory for the exact type of the value, covering the most
+    # common types of values; all other values are handled by the isinstance checks
+    # below
+    factory = (_EXPRESSION_FACTORIES or _init_expression_factories()).get(
+        type(value), None
+    )
+    if factory is not None:
+        return factory(value)
+
+    if isinstance(value, Expression):
+        # expressions are the most common values, e.g., arguments of calls and
+        # operands of operations, and are returned as they are
+        return value
+    elif isinstance(value, HasExpressionRepr):
         return value.to_expression()
     elif isinstance(value, str):
         from .atomic import Lit
@@ -528,31 +728,23 @@ def make_expression(value: Any) -> Expression:
         return DictLiteral(*value.items())
     elif isinstance(value, np.ndarray):
         from .atomic import Id
+        from .base import BracketPair
         from .composite import ListLiteral
 
         def _ndarray_to_expression(array: npt.NDArray[Any]) -> Expression:
             if array.ndim == 1:
                 return ListLiteral(*array)
             else:
-                return ListLiteral(*map(_ndarray_to_expression, array))
+                # the rows are expressions already, so we can skip their conversion
+                # noinspection PyProtectedMember
+                return ListLiteral._from_expressions(
+                    BracketPair.SQUARE, tuple(map(_ndarray_to_expression, array))
+                )
 
         if value.ndim == 0:
             return Id.array(value[()])
         else:
             return Id.array(_ndarray_to_expression(value))
-
-    elif isinstance(value, slice):
-        from .atomic import Epsilon
-        from .composite import BinaryOperation
-
-        args = [
-            Epsilon() if value is None else value
-            for value in (value.start, value.stop, value.step)
-        ]
-        if value.step is not None:
-            return BinaryOperation(BinaryOperator.SLICE, *args)
-        else:
-            return BinaryOperation(BinaryOperator.SLICE, args[0], args[1])
     else:
         name: Optional[str] = getattr(value, "__name__", None)
         if name:
@@ -595,6 +787,8 @@ class ExpressionAlias(Expression):
     indistinguishable from their non-aliased counterparts.
     """
 
+    __slots__ = ("_expression",)
+
     def __init__(self, expression: Expression) -> None:
         """
         :param expression: the expression referred to by this alias
@@ -628,12 +822,139 @@ class ExpressionAlias(Expression):
         """[see superclass]"""
         return (self._expression,)
 
-    def hash_(self) -> int:
-        """[see superclass]"""
-        return self.expression_.hash_()
+    def _hash_node(self, subexpression_hashes: List[int]) -> int:
+        # an alias has the same hash code as the expression it represents
+        (expression_hash,) = subexpression_hashes
+        return expression_hash
 
-    def _eq_same_type(self, other: ExpressionAlias) -> bool:
-        return self._expression.eq_(other._expression)
+    def _eq_node(self, other: ExpressionAlias) -> bool:
+        # aliases are equal if the expressions they represent are equal
+        return True
 
 
 __tracker.validate()
+
+
+#
+# Private helpers
+#
+
+# the default formatters, keyed by their single_line flag; created on first use
+_DEFAULT_FORMATTERS: Dict[bool, ExpressionFormatter] = {}
+
+# factories for converting values of common types to expressions, keyed by the exact
+# type of the value; populated on first use to avoid circular imports
+_EXPRESSION_FACTORIES: Dict[type, Callable[[Any], Expression]] = {}
+
+
+def _init_expression_factories() -> Dict[type, Callable[[Any], Expression]]:
+    from .atomic import Lit
+    from .composite import DictLiteral, ListLiteral, SetLiteral, TupleLiteral
+
+    factories: Dict[type, Callable[[Any], Expression]] = {
+        str: Lit,
+        int: Lit,
+        float: Lit,
+        complex: Lit,
+        bool: Lit,
+        bytes: Lit,
+        type(None): Lit,
+        list: lambda value: ListLiteral(*value),
+        tuple: lambda value: TupleLiteral(*value),
+        set: lambda value: SetLiteral(*value),
+        dict: lambda value: DictLiteral(*value.items()),
+        # slice cannot be subclassed, so this covers all slices
+        slice: _slice_to_expression,
+    }
+    _EXPRESSION_FACTORIES.update(factories)
+    return _EXPRESSION_FACTORIES
+
+
+def _slice_to_expression(value: slice) -> Expression:
+    from .atomic import Epsilon
+    from .composite import BinaryOperation
+
+    args = [
+        Epsilon() if value is None else value
+        for value in (value.start, value.stop, value.step)
+    ]
+    if value.step is not None:
+        return BinaryOperation(BinaryOperator.SLICE, *args)
+    else:
+        return BinaryOperation(BinaryOperator.SLICE, args[0], args[1])
+
+
+# constructors of the composite expressions created by the operator methods of class
+# Expression; the composite module depends on this module, so we cannot import the
+# constructors at module level, but bind them on first use instead of importing them
+# on every call
+
+
+def _bind_composite_constructors() -> None:
+    global _binary_operation, _unary_operation, _call
+    from .composite import BinaryOperation, Call, UnaryOperation
+
+    _binary_operation = BinaryOperation
+    _unary_operation = UnaryOperation
+    _call = Call
+
+
+def _init_binary_operation(operator: BinaryOperator, *operands: Any) -> Expression:
+    _bind_composite_constructors()
+    return _binary_operation(operator, *operands)
+
+
+def _init_unary_operation(operator: UnaryOperator, operand: Any) -> Expression:
+    _bind_composite_constructors()
+    return _unary_operation(operator, operand)
+
+
+def _init_call(callee: Any, *args: Any, **kwargs: Any) -> Expression:
+    _bind_composite_constructors()
+    return _call(callee, *args, **kwargs)
+
+
+_binary_operation: Callable[..., Expression] = _init_binary_operation
+_unary_operation: Callable[..., Expression] = _init_unary_operation
+_call: Callable[..., Expression] = _init_call
+
+
+def _legacy_hash_node(self: Expression, subexpression_hashes: List[int]) -> int:
+    # expressions overriding method hash_ hash their subexpressions themselves
+    return self.hash_()
+
+
+def _legacy_super_hash(expression: Expression) -> int:
+    # Calculate the hash code of an expression overriding method hash_, as calculated
+    # by the first superclass implementing method _hash_node.
+    #
+    # We must not use the cached hash code of the expression, since it is the hash
+    # code returned by the overriding method.
+
+    hashes: Dict[int, int] = {}
+    # noinspection PyProtectedMember
+    subexpression_hashes = [
+        subexpression._hash_tree(hashes)
+        if subexpression._hash is None
+        else subexpression._hash
+        for subexpression in expression.subexpressions_
+    ]
+
+    hash_node = next(
+        cls.__dict__["_hash_node"]
+        for cls in type(expression).__mro__
+        if cls.__dict__.get("_hash_node", _legacy_hash_node) is not _legacy_hash_node
+    )
+    return cast(int, hash_node(expression, subexpression_hashes))
+
+
+def _legacy_eq_node(self: Any, other: Any) -> bool:
+    # expressions implementing method _eq_same_type compare their subexpressions
+    # themselves
+    return bool(self._eq_same_type(other))
+
+
+def _legacy_eq_subexpressions(self: Expression) -> Tuple[Expression, ...]:
+    # expressions implementing method _eq_same_type have no subexpressions left to
+    # compare
+    return ()
@@ -5,7 +5,9 @@ from __future__ import annotations
 
 import logging
 from abc import ABCMeta
-from typing import Any, Generic, MutableMapping, TypeVar
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Generic, MutableMapping, Optional, Tuple, TypeVar
 from weakref import WeakValueDictionary
 
 from ...api import AllTracker, inheritdoc
@@ -44,12 +46,41 @@ __tracker = AllTracker(globals())
 #
 
 
+class _LiteralMeta(ABCMeta):
+    # literals of these types are interned; we do not intern floats since equal values
+    # can have different representations, e.g., 0.0 and -0.0
+    _INTERNED_TYPES = frozenset({str, int, bool, bytes, type(None)})
+
+    _literals: MutableMapping[Tuple[type, Any], Lit[Any]] = WeakValueDictionary()
+
+    def __call__(cls, value: Any) -> Any:
+        value_type = type(value)
+        if cls is not Lit or value_type not in _LiteralMeta._INTERNED_TYPES:
+            return super().__call__(value)
+
+        # include the type in the key, so that, e.g., 1 and True are kept apart
+        key = (value_type, value)
+        literal = _LiteralMeta._literals.get(key, None)
+        if literal is None:
+            _LiteralMeta._literals[key] = literal = super().__call__(value)
+
+        return literal
+
+
 @inheritdoc(match="[see superclass]")
-class Lit(AtomicExpression[T_Literal], Generic[T_Literal]):
+class Lit(AtomicExpression[T_Literal], Generic[T_Literal], metaclass=_LiteralMeta):
     """
     A literal value (usually a number or string).
+
+    Literals of immutable built-in types (strings, integers, booleans, bytes, and
+    ``None``) are interned: creating a literal for a value of one of these types
+    returns the identical :class:`Lit` instance for as long as that instance is
+    referenced elsewhere.
     """
 
+    # interned literals are referenced weakly
+    __slots__ = ("_value", "__weakref__")
+
     def __init__(self, value: T_Literal) -> None:
         """
         :param value: the literal value represented by this expression
@@ -69,7 +100,15 @@ class Lit(AtomicExpression[T_Literal], Generic[T_Literal]):
 
 
 class _IdentifierMeta(ABCMeta):
-    _identifiers: MutableMapping[str, Id] = WeakValueDictionary()
+    # identifiers are few and typically long-lived, so we keep them in a plain
+    # dictionary rather than a weak reference dictionary, evicting the least recently
+    # used identifier once the maximum number of identifiers is exceeded
+    _MAX_IDENTIFIERS = 4096
+
+    _identifiers: OrderedDict[str, Id] = OrderedDict()
+
+    # guards the identifier cache, whose updates consist of multiple steps
+    _identifiers_lock = Lock()
 
     def __getattr__(self, name: str) -> Id:
         if name.startswith("_") or name.endswith("_") or name == "Id":
@@ -77,9 +116,23 @@ class _IdentifierMeta(ABCMeta):
             # we also disallow "Id" to avoid a compatibility issue with sphinx
             raise AttributeError(name)
 
-        identifier = _IdentifierMeta._identifiers.get(name, None)
-        if identifier is None:
-            _IdentifierMeta._identifiers[name] = identifier = Id(name)
+        return Id(name)
+
+    def __call__(cls, name: Any) -> Any:
+        if cls is not Id:
+            return super().__call__(name)
+
+        name = _identifier_name(name)
+
+        identifiers = _IdentifierMeta._identifiers
+        with _IdentifierMeta._identifiers_lock:
+            identifier = identifiers.get(name, None)
+            if identifier is None:
+                identifiers[name] = identifier = super().__call__(name)
+                if len(identifiers) > _IdentifierMeta._MAX_IDENTIFIERS:
+                    identifiers.popitem(last=False)
+            else:
+                identifiers.move_to_end(name)
 
         return identifier
 
@@ -94,9 +147,10 @@ class Id(AtomicExpression[str], metaclass=_IdentifierMeta):
     - class instantiation: ``Id("x")``
     - attribute access: ``Id.x``
 
-    The attribute access method will return the identical :class:`Id` instance
-    for subsequent access to an attribute of the same name (stored internally using a
-    weak reference dictionary).
+    Both methods will return the identical :class:`Id` instance for subsequent
+    identifiers of the same name, as long as the name is among the 4096 most recently
+    used identifier names. The cache of these identifiers keeps them alive, even if
+    they are not referenced elsewhere.
     Creating identifiers using attribute access requires attribute names that do not
     start or end with an underscore character (``_``), otherwise an
     :class:`AttributeError` is raised.
@@ -104,6 +158,8 @@ class Id(AtomicExpression[str], metaclass=_IdentifierMeta):
     Evaluating ``Id.Id`` will raise an :class:`AttributeError`.
     """
 
+    __slots__ = ("_name",)
+
     # the name of this identifier
     _name: str
 
@@ -112,13 +168,7 @@ class Id(AtomicExpression[str], metaclass=_IdentifierMeta):
         :param name: the name of the identifier
         """
         super().__init__()
-        if not isinstance(name, str):
-            name = getattr(name, "__name__", None)
-            if not name:
-                raise TypeError(
-                    "arg name must be a string, or must have attribute __name__"
-                )
-        self._name = name
+        self._name = _identifier_name(name)
 
     @property
     def value_(self) -> str:
@@ -141,6 +191,9 @@ class Epsilon(AtomicExpression[None], metaclass=_EpsilonMeta):
     A singleton class representing the empty expression.
     """
 
+    # the singleton instance is referenced weakly
+    __slots__ = ("__weakref__",)
+
     @property
     def value_(self) -> None:
         """[see superclass]"""
@@ -153,3 +206,18 @@ class Epsilon(AtomicExpression[None], metaclass=_EpsilonMeta):
 
 
 __tracker.validate()
+
+
+#
+# Private helpers
+#
+
+
+def _identifier_name(name: Any) -> str:
+    # get the name of an identifier from a string, or from an object with a name
+    if isinstance(name, str):
+        return name
+    object_name: Optional[str] = getattr(name, "__name__", None)
+    if not object_name:
+        raise TypeError("arg name must be a string, or must have attribute __name__")
+    return object_name
@@ -6,7 +6,7 @@ from __future__ import annotations
 
 import logging
 from abc import ABCMeta, abstractmethod
-from typing import Any, Generic, Iterable, Tuple, TypeVar
+from typing import Any, Dict, Generic, Iterable, List, Tuple, Type, TypeVar
 
 from ...api import AllTracker, inheritdoc
 from .. import Expression, HasExpressionRepr, make_expression
@@ -37,6 +37,7 @@ __all__ = [
 #
 
 T = TypeVar("T")
+T_CollectionLiteral = TypeVar("T_CollectionLiteral", bound="CollectionLiteral")
 
 
 #
@@ -56,7 +57,6 @@ __tracker = AllTracker(globals())
 #
 
 
-@inheritdoc(match="[see superclass]")
 class AtomicExpression(Expression, Generic[T], metaclass=ABCMeta):
     """
     An atomic expression.
@@ -64,6 +64,8 @@ class AtomicExpression(Expression, Generic[T], metaclass=ABCMeta):
     Atomic expressions include literals and identifiers, and have no subexpressions.
     """
 
+    __slots__ = ()
+
     @property
     def subexpressions_(self) -> Tuple[Expression, ...]:
         """
@@ -88,17 +90,15 @@ class AtomicExpression(Expression, Generic[T], metaclass=ABCMeta):
         """
         pass
 
-    @property
-    def precedence_(self) -> int:
-        """[see superclass]"""
-        return BinaryOperator.MAX_PRECEDENCE
+    #: Atomic expressions have the highest possible precedence; a class attribute
+    #: rather than a property, for fast lookup when formatting expressions.
+    precedence_ = BinaryOperator.MAX_PRECEDENCE
 
-    def _eq_same_type(self, other: AtomicExpression[Any]) -> bool:
+    def _eq_node(self, other: AtomicExpression[Any]) -> bool:
         # mypy considers the type of this expression Any, not bool
         return self.value_ == other.value_  # type: ignore
 
-    def hash_(self) -> int:
-        """[see superclass]"""
+    def _hash_node(self, subexpression_hashes: List[int]) -> int:
         return hash((type(self), self.value_))
 
 
@@ -112,6 +112,8 @@ class SingletonExpression(Expression, metaclass=ABCMeta):
     An expression with a single subexpression.
     """
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def subexpression_(self) -> Expression:
@@ -152,6 +154,10 @@ class BracketPair(HasExpressionRepr):
     #: The closing bracket.
     closing: str
 
+    # expressions representing bracket pairs, keyed by their opening and closing
+    # brackets; expressions cannot change, so we share them across bracket pairs
+    _expressions: Dict[Tuple[str, str], Expression] = {}
+
     def __init__(self, opening: str, closing: str) -> None:
         """
         :param opening: the opening bracket
@@ -162,9 +168,16 @@ class BracketPair(HasExpressionRepr):
 
     def to_expression(self) -> Expression:
         """[see superclass]"""
-        from ..atomic import Id
-
-        return Id(BracketPair.__name__)(opening=self.opening, closing=self.closing)
+        # the brackets can be changed, so we look up the expression on every call
+        key = (self.opening, self.closing)
+        expression = BracketPair._expressions.get(key, None)
+        if expression is None:
+            from ..atomic import Id
+
+            BracketPair._expressions[key] = expression = Id(BracketPair.__name__)(
+                opening=self.opening, closing=self.closing
+            )
+        return expression
 
 
 BracketPair.ROUND = BracketPair("(", ")")
@@ -179,6 +192,8 @@ class BracketedExpression(SingletonExpression, metaclass=ABCMeta):
     An expression surrounded by brackets.
     """
 
+    __slots__ = ("_brackets", "_subexpression", "_subexpressions")
+
     def __init__(self, brackets: BracketPair, subexpression: Any) -> None:
         """
         :param brackets: the brackets enclosing this expression's subexpressions
@@ -186,7 +201,9 @@ class BracketedExpression(SingletonExpression, metaclass=ABCMeta):
         """
         super().__init__()
         self._brackets = brackets
-        self._subexpression = make_expression(subexpression)
+        self._subexpression = subexpression = make_expression(subexpression)
+        # the subexpressions are fixed, so we create their tuple only once
+        self._subexpressions = (subexpression,)
 
     @property
     def brackets_(self) -> BracketPair:
@@ -203,25 +220,28 @@ class BracketedExpression(SingletonExpression, metaclass=ABCMeta):
         return self._subexpression
 
     @property
-    def precedence_(self) -> int:
+    def subexpressions_(self) -> Tuple[Expression, ...]:
         """[see superclass]"""
-        return Operator.MAX_PRECEDENCE
+        return self._subexpressions
 
-    def hash_(self) -> int:
-        """[see superclass]"""
-        return hash((type(self), self.brackets_, self.subexpression_.hash_()))
+    #: Bracketed expressions have the highest possible precedence.
+    precedence_ = Operator.MAX_PRECEDENCE
 
-    def _eq_same_type(self, other: BracketedExpression) -> bool:
-        return self.brackets_ == other.brackets_ and self.subexpression_.eq_(
-            other.subexpression_
-        )
+    def _hash_node(self, subexpression_hashes: List[int]) -> int:
+        return hash((type(self), self.brackets_, *subexpression_hashes))
+
+    def _eq_node(self, other: BracketedExpression) -> bool:
+        return self.brackets_ == other.brackets_
 
 
+@inheritdoc(match="[see superclass]")
 class CollectionLiteral(BracketedExpression):
     """
     A collection literal, e.g., a list, set, tuple, or dictionary.
     """
 
+    __slots__ = ("_elements",)
+
     _elements: Tuple[Expression, ...]
 
     def __init__(self, brackets: BracketPair, elements: Iterable[Any]) -> None:
@@ -230,22 +250,51 @@ class CollectionLiteral(BracketedExpression):
         :param elements: the elements of the collection
         """
 
+        self._init_collection(brackets, tuple(map(make_expression, elements)))
+
+    @classmethod
+    def _from_expressions(
+        cls: Type[T_CollectionLiteral],
+        brackets: BracketPair,
+        elements: Tuple[Expression, ...],
+    ) -> T_CollectionLiteral:
+        # create a collection literal from elements that are already expressions,
+        # skipping the conversion of the elements
+        collection = cls.__new__(cls)
+        collection._init_collection(brackets, elements)
+        return collection
+
+    def _init_collection(
+        self, brackets: BracketPair, elements: Tuple[Expression, ...]
+    ) -> None:
+        # most collections are function arguments, and their subexpression is only
+        # needed when hashing, comparing, or formatting the collection; we therefore
+        # create the subexpression on first use, leaving its slots unset until then
+        self._brackets = brackets
+        self._elements = elements
+
+    def _init_subexpression(self) -> Tuple[Expression]:
+        # create the subexpression combining the elements of this collection
         from ..atomic import Epsilon
         from ..composite import BinaryOperation
 
-        elements_tuple: Tuple[Expression, ...] = tuple(map(make_expression, elements))
+        elements = self._elements
 
         subexpression: Expression
-        if not elements_tuple:
+        if not elements:
             subexpression = Epsilon()
-        elif len(elements_tuple) == 1:
-            subexpression = elements_tuple[0]
+        elif len(elements) == 1:
+            subexpression = elements[0]
         else:
-            subexpression = BinaryOperation(BinaryOperator.COMMA, *elements_tuple)
-
-        super().__init__(brackets, subexpression)
+            # the elements are expressions already, so we can skip their conversion
+            # noinspection PyProtectedMember
+            subexpression = BinaryOperation._from_expressions(
+                BinaryOperator.COMMA, elements
+            )
 
-        self._elements = elements_tuple
+        self._subexpression = subexpression
+        self._subexpressions = subexpressions = (subexpression,)
+        return subexpressions
 
     @property
     def subexpression_(self) -> Expression:
@@ -257,7 +306,18 @@ class CollectionLiteral(BracketedExpression):
         - a :class:`.BinaryOperation` with a :attr:`.BinaryOperator.COMMA`
           operator for collections with two or more elements
         """
-        return super().subexpression_
+        try:
+            return self._subexpression
+        except AttributeError:
+            return self._init_subexpression()[0]
+
+    @property
+    def subexpressions_(self) -> Tuple[Expression, ...]:
+        """[see superclass]"""
+        try:
+            return self._subexpressions
+        except AttributeError:
+            return self._init_subexpression()
 
     @property
     def elements_(self) -> Tuple[Expression, ...]:
@@ -278,6 +338,8 @@ class Operation(Expression, metaclass=ABCMeta):
     Abstract base class for operation expressions.
     """
 
+    __slots__ = ()
+
     @property
     def subexpressions_(self) -> Tuple["Expression", ...]:
         """[see superclass]"""
@@ -305,7 +367,6 @@ class Operation(Expression, metaclass=ABCMeta):
 #
 
 
-@inheritdoc(match="[see superclass]")
 class PrefixExpression(Expression, metaclass=ABCMeta):
     """
     A prefix expression.
@@ -314,6 +375,8 @@ class PrefixExpression(Expression, metaclass=ABCMeta):
     characters.
     """
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def prefix_(self) -> Expression:
@@ -344,14 +407,14 @@ class PrefixExpression(Expression, metaclass=ABCMeta):
         """
         return self.prefix_, self.body_
 
-    def _eq_same_type(self, other: PrefixExpression) -> bool:
-        return self.prefix_.eq_(other.prefix_) and self.body_.eq_(other.body_)
+    def _eq_node(self, other: PrefixExpression) -> bool:
+        # compare the separators, consistent with the hash; unary operations differ
+        # only by their separators, i.e., their operators
+        return self.separator_ == other.separator_
 
-    def hash_(self) -> int:
-        """[see superclass]"""
-        return hash(
-            (type(self), self.prefix_.hash_(), self.separator_, self.body_.hash_())
-        )
+    def _hash_node(self, subexpression_hashes: List[int]) -> int:
+        prefix_hash, body_hash = subexpression_hashes
+        return hash((type(self), prefix_hash, self.separator_, body_hash))
 
 
 @inheritdoc(match="[see superclass]")
@@ -360,14 +423,18 @@ class SimplePrefixExpression(PrefixExpression, metaclass=ABCMeta):
     An abstract base implementation of simple prefix expressions.
     """
 
+    __slots__ = ("_prefix", "_body", "_subexpressions")
+
     def __init__(self, prefix: Any, body: Any) -> None:
         """
         :param prefix: the prefix of the expression
         :param body: the body of the expression
         """
         super().__init__()
-        self._prefix = make_expression(prefix)
-        self._body = make_expression(body)
+        self._prefix = prefix = make_expression(prefix)
+        self._body = body = make_expression(body)
+        # the subexpressions are fixed, so we create their tuple only once
+        self._subexpressions = (prefix, body)
 
     @property
     def prefix_(self) -> Expression:
@@ -379,6 +446,11 @@ class SimplePrefixExpression(PrefixExpression, metaclass=ABCMeta):
         """[see superclass]"""
         return self._body
 
+    @property
+    def subexpressions_(self) -> Tuple[Expression, ...]:
+        """[see superclass]"""
+        return self._subexpressions
+
 
 @inheritdoc(match="[see superclass]")
 class Invocation(PrefixExpression):
@@ -387,7 +459,10 @@ class Invocation(PrefixExpression):
     ``<expression>[<expression>]``.
     """
 
-    _PRECEDENCE = BinaryOperator.DOT.precedence
+    __slots__ = ("_prefix", "_invocation", "_subexpressions")
+
+    #: Invocations have the same precedence as the ``.`` operator.
+    precedence_ = BinaryOperator.DOT.precedence
 
     def __init__(self, prefix: Any, brackets: BracketPair, args: Iterable[Any]) -> None:
         """
@@ -396,8 +471,12 @@ class Invocation(PrefixExpression):
         :param args: the invocation argument(s); can also be an empty iterable
         """
         super().__init__()
-        self._prefix = make_expression(prefix)
-        self._invocation = CollectionLiteral(brackets=brackets, elements=args)
+        self._prefix = prefix = make_expression(prefix)
+        self._invocation = invocation = CollectionLiteral(
+            brackets=brackets, elements=args
+        )
+        # the subexpressions are fixed, so we create their tuple only once
+        self._subexpressions = (prefix, invocation)
 
     @property
     def prefix_(self) -> Expression:
@@ -412,9 +491,9 @@ class Invocation(PrefixExpression):
         return self._invocation
 
     @property
-    def precedence_(self) -> int:
+    def subexpressions_(self) -> Tuple[Expression, ...]:
         """[see superclass]"""
-        return Invocation._PRECEDENCE
+        return self._subexpressions
 
 
 #
@@ -422,12 +501,13 @@ class Invocation(PrefixExpression):
 #
 
 
-@inheritdoc(match="[see superclass]")
 class InfixExpression(Expression, metaclass=ABCMeta):
     """
     An infix expression, separating any number of subexpressions with an infix symbol.
     """
 
+    __slots__ = ()
+
     @property
     @abstractmethod
     def infix_(self) -> BinaryOperator:
@@ -436,15 +516,11 @@ class InfixExpression(Expression, metaclass=ABCMeta):
         """
         pass
 
-    def hash_(self) -> int:
-        """[see superclass]"""
-        return hash(
-            (
-                type(self),
-                self.infix_,
-                *(subexpression.hash_() for subexpression in self.subexpressions_),
-            )
-        )
+    def _hash_node(self, subexpression_hashes: List[int]) -> int:
+        # the infix already tells infix expressions apart, so we do not include the
+        # type of this expression; subclasses differing only by type, e.g., attribute
+        # references and dot operations, hash alike and are told apart by eq_
+        return hash((self.infix_, *subexpression_hashes))
 
 
 __tracker.validate()
@@ -6,7 +6,7 @@ from __future__ import annotations
 import itertools
 import logging
 from abc import ABCMeta
-from typing import Any, Tuple, TypeVar, Union, cast
+from typing import Any, List, Tuple, TypeVar, Union, cast
 
 from ...api import AllTracker, inheritdoc
 from .. import Expression, ExpressionAlias, make_expression
@@ -72,6 +72,8 @@ class ListLiteral(CollectionLiteral):
     A list expression.
     """
 
+    __slots__ = ()
+
     def __init__(self, *elements: Any) -> None:
         """
         :param elements: the list elements
@@ -84,6 +86,8 @@ class TupleLiteral(CollectionLiteral):
     A tuple expression.
     """
 
+    __slots__ = ()
+
     def __init__(self, *elements: Any) -> None:
         """
         :param elements: the tuple elements
@@ -96,6 +100,8 @@ class SetLiteral(CollectionLiteral):
     A set expression.
     """
 
+    __slots__ = ()
+
     def __init__(self, *elements: Any) -> None:
         """
         :param elements: the set elements
@@ -108,16 +114,19 @@ class DictLiteral(CollectionLiteral):
     A dictionary expression.
     """
 
+    __slots__ = ()
+
     def __init__(self, *args: Tuple[Any, Any], **kwargs: Any) -> None:
         """
         :param args: dictionary entries as tuples ``(key, value)``
         :param kwargs: dictionary entries as keyword arguments
         """
-        super().__init__(
-            brackets=BracketPair.CURLY,
-            elements=(
-                DictEntry(key, value)
-                for key, value in itertools.chain(args, kwargs.items())
+        # the entries are expressions already, so we can skip their conversion
+        self._init_collection(
+            BracketPair.CURLY,
+            (
+                *[DictEntry(key, value) for key, value in args],
+                *[DictEntry(key, value) for key, value in kwargs.items()],
             ),
         )
 
@@ -133,6 +142,11 @@ class UnaryOperation(SimplePrefixExpression, Operation, metaclass=ABCMeta):
     A unary operation.
     """
 
+    __slots__ = ("_operator", "precedence_")
+
+    #: The precedence of this operation, i.e., the precedence of its operator.
+    precedence_: int
+
     def __init__(self, operator: UnaryOperator, operand: Any) -> None:
         """
         :param operator: the unary operator
@@ -140,6 +154,7 @@ class UnaryOperation(SimplePrefixExpression, Operation, metaclass=ABCMeta):
         """
         super().__init__(prefix=Epsilon(), body=operand)
         self._operator = operator
+        self.precedence_ = operator.precedence
 
     @property
     def separator_(self) -> str:
@@ -154,12 +169,8 @@ class UnaryOperation(SimplePrefixExpression, Operation, metaclass=ABCMeta):
     @property
     def operands_(self) -> Tuple[Expression, ...]:
         """[see superclass]"""
-        return self.subexpressions_
-
-    @property
-    def precedence_(self) -> int:
-        """[see superclass]"""
-        return self._operator.precedence
+        # the same tuple as the subexpressions, created once at construction
+        return self._subexpressions
 
 
 @inheritdoc(match="[see superclass]")
@@ -168,6 +179,11 @@ class BinaryOperation(InfixExpression, Operation):
     A operation with two or more operands.
     """
 
+    __slots__ = ("_operator", "_operands", "precedence_")
+
+    #: The precedence of this operation, i.e., the precedence of its operator.
+    precedence_: int
+
     def __init__(self, operator: BinaryOperator, *operands: Any) -> None:
         """
         :param operator: the binary operator applied by this operation
@@ -180,22 +196,41 @@ class BinaryOperation(InfixExpression, Operation):
         if len(operands) < 2:
             raise ValueError("operation requires at least two operands")
 
-        operands_expr: Tuple[Expression, ...] = tuple(
-            make_expression(operand) for operand in operands
-        )
-
-        first_operand = operands_expr[0]
+        for operand in operands:
+            if not isinstance(operand, Expression):
+                # convert the operands only if at least one of them is not an
+                # expression already
+                operands = tuple(map(make_expression, operands))
+                break
+
+        self._init_operation(operator, operands)
+
+    @classmethod
+    def _from_expressions(
+        cls, operator: BinaryOperator, operands: Tuple[Expression, ...]
+    ) -> BinaryOperation:
+        # create an operation from two or more operands that are already expressions,
+        # skipping the validation and conversion of the operands
+        operation: BinaryOperation = cls.__new__(cls)
+        operation._init_operation(operator, operands)
+        return operation
+
+    def _init_operation(
+        self, operator: BinaryOperator, operands: Tuple[Expression, ...]
+    ) -> None:
+        first_operand = operands[0]
 
         if (
             isinstance(first_operand, BinaryOperation)
-            and first_operand.operator_ == operator
+            and first_operand.operator_ is operator
         ):
             # if first operand has the same operator, we flatten the operand
             # noinspection PyUnresolvedReferences
-            operands_expr = (*first_operand.operands_, *operands_expr[1:])
+            operands = (*first_operand.operands_, *operands[1:])
 
         self._operator = operator
-        self._operands = operands_expr
+        self._operands = operands
+        self.precedence_ = operator.precedence
 
     @property
     def operator_(self) -> BinaryOperator:
@@ -212,35 +247,43 @@ class BinaryOperation(InfixExpression, Operation):
         """[see superclass]"""
         return self._operator
 
-    @property
-    def precedence_(self) -> int:
-        """[see superclass]"""
-        return self.infix_.precedence
-
-    def _flattened_operands(self) -> Tuple[Expression, ...]:
+    def _eq_subexpressions(self) -> Tuple[Expression, ...]:
+        # compare the flattened operands: operations flatten a first operand with the
+        # same operator at construction, but not if the first operand is an alias of
+        # such an operation; here we flatten aliased first operands as well, in a loop
+        # over nested operations
+        operator = self.operator_
         operands = self.operands_
-        first_operand = operands[0]
 
-        while isinstance(first_operand, ExpressionAlias):
-            first_operand = first_operand.expression_
+        # the trailing operands of the outer operations, from the outside in
+        trailing_operands: List[Tuple[Expression, ...]] = []
+
+        while True:
+            first_operand = operands[0]
+            if not isinstance(first_operand, ExpressionAlias):
+                break
+
+            while isinstance(first_operand, ExpressionAlias):
+                first_operand = first_operand.expression_
 
             if (
                 isinstance(first_operand, BinaryOperation)
-                and first_operand.operator_ == self.operator_
+                and first_operand.operator_ is operator
             ):
-                return (*first_operand._flattened_operands(), *operands[1:])
+                trailing_operands.append(operands[1:])
+                operands = first_operand.operands_
+            else:
+                break
 
-        return operands
+        if not trailing_operands:
+            return operands
 
-    def _eq_same_type(self, other: BinaryOperation) -> bool:
-        if self.operator_ == other.operator_:
-            self_operands_ = self._flattened_operands()
-            other_operands_ = other._flattened_operands()
-            return len(self_operands_) == len(other_operands_) and all(
-                a.eq_(b) for a, b in zip(self_operands_, other_operands_)
-            )
-        else:
-            return False
+        return tuple(itertools.chain(operands, *reversed(trailing_operands)))
+
+    def _eq_node(self, other: BinaryOperation) -> bool:
+        # operators do not define equality beyond identity, so we compare them with
+        # "is" rather than "=="
+        return self.operator_ is other.operator_
 
 
 #
@@ -253,20 +296,20 @@ class Call(Invocation):
     A call expression.
     """
 
+    __slots__ = ()
+
     def __init__(self, callee: Any, *args: Any, **kwargs: Any) -> None:
         """
         :param callee: the expression representing the object being called
         :param args: the positional argument(s) of the call
         :param kwargs: the keyword arguments of the call
         """
-        super().__init__(
-            prefix=callee,
-            brackets=BracketPair.ROUND,
-            args=(
+        if kwargs:
+            args = (
                 *args,
-                *(KeywordArgument(name, item) for name, item in kwargs.items()),
-            ),
-        )
+                *[KeywordArgument(name, item) for name, item in kwargs.items()],
+            )
+        super().__init__(prefix=callee, brackets=BracketPair.ROUND, args=args)
 
     @property
     def callee_(self) -> Expression:
@@ -281,6 +324,8 @@ class Index(Invocation):
     An indexing operation.
     """
 
+    __slots__ = ()
+
     def __init__(self, collection: Any, key: Any) -> None:
         """
         :param collection: the collection to be indexed
@@ -308,7 +353,10 @@ class Lambda(SimplePrefixExpression):
     A lambda expression.
     """
 
-    _PRECEDENCE = UnaryOperator.LAMBDA.precedence
+    __slots__ = ("_has_params",)
+
+    #: Lambda expressions have the precedence of the ``lambda`` operator.
+    precedence_ = UnaryOperator.LAMBDA.precedence
 
     def __init__(self, *params: Id, body: Any) -> None:
         """
@@ -318,11 +366,6 @@ class Lambda(SimplePrefixExpression):
         super().__init__(prefix=Epsilon(), body=LambdaDefinition(*params, body=body))
         self._has_params = len(params) > 0
 
-    @property
-    def precedence_(self) -> int:
-        """[see superclass]"""
-        return Lambda._PRECEDENCE
-
     @property
     def separator_(self) -> str:
         """[see superclass]"""
@@ -342,6 +385,8 @@ class Attr(BinaryOperation):
     The ``….…`` ("dot") operation to reference an attribute of an object.
     """
 
+    __slots__ = ()
+
     def __init__(self, obj: Any, attribute: Union[Id, str]) -> None:
         """
         :param obj: the object whose attribute is referenced
@@ -352,9 +397,15 @@ class Attr(BinaryOperation):
         elif not isinstance(attribute, cast(type, Id)):
             raise TypeError("arg attribute must be a string or an Identifier")
 
-        if isinstance(obj, Attr):
-            sub = obj.subexpressions_
-            super().__init__(BinaryOperator.DOT, sub[0], *(sub[1:]), attribute)
+        if isinstance(obj, Expression):
+            # the operands are expressions already, so we skip their validation and
+            # conversion; if the object is an attribute chain, we extend the chain
+            self._init_operation(
+                BinaryOperator.DOT,
+                (*obj.operands_, cast(Id, attribute))
+                if isinstance(obj, Attr)
+                else (obj, cast(Id, attribute)),
+            )
         else:
             super().__init__(BinaryOperator.DOT, obj, attribute)
 
@@ -42,7 +42,10 @@ class KeywordArgument(SimplePrefixExpression):
     A keyword argument, used by functions.
     """
 
-    _PRECEDENCE = BinaryOperator.EQ.precedence
+    __slots__ = ("_name",)
+
+    #: Keyword arguments have the precedence of the ``=`` operator.
+    precedence_ = BinaryOperator.EQ.precedence
 
     def __init__(self, name: str, value: Any) -> None:
         """
@@ -71,19 +74,16 @@ class KeywordArgument(SimplePrefixExpression):
         """
         return self.body_
 
-    @property
-    def precedence_(self) -> int:
-        """[see superclass]"""
-        return self._PRECEDENCE
-
 
-@inheritdoc(match="[see superclass]")
 class DictEntry(SimplePrefixExpression):
     """
     Two expressions separated by a colon, used in dictionaries.
     """
 
-    _PRECEDENCE = BinaryOperator.COLON.precedence
+    __slots__ = ()
+
+    #: Dictionary entries have the precedence of the ``:`` operator.
+    precedence_ = BinaryOperator.COLON.precedence
 
     def __init__(self, key: Any, value: Any) -> None:
         """
@@ -111,19 +111,16 @@ class DictEntry(SimplePrefixExpression):
         """
         return self.body_
 
-    @property
-    def precedence_(self) -> int:
-        """[see superclass]"""
-        return DictEntry._PRECEDENCE
-
 
-@inheritdoc(match="[see superclass]")
 class LambdaDefinition(SimplePrefixExpression):
     """
     Function parameters and body separated by a colon, used inside lambda expressions.
     """
 
-    _PRECEDENCE = UnaryOperator.LAMBDA.precedence
+    __slots__ = ()
+
+    #: Lambda definitions have the precedence of the ``lambda`` operator.
+    precedence_ = UnaryOperator.LAMBDA.precedence
 
     def __init__(self, *params: Id, body: Any) -> None:
         """
@@ -154,8 +151,3 @@ class LambdaDefinition(SimplePrefixExpression):
     def separator_(self) -> str:
         """A ``:``, followed by a space."""
         return ": "
-
-    @property
-    def precedence_(self) -> int:
-        """[see superclass]"""
-        return LambdaDefinition._PRECEDENCE
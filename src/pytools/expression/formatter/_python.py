@@ -6,7 +6,7 @@ from __future__ import annotations
 import logging
 from abc import ABCMeta, abstractmethod
 from dataclasses import dataclass
-from typing import Any, List, NamedTuple, Tuple
+from typing import Any, Dict, List, Mapping, NamedTuple, Tuple, Union
 
 from .. import Expression, ExpressionAlias, ExpressionFormatter
 from ..base import (
@@ -98,6 +98,26 @@ class TextualForm:
         :return: the resulting textual form
         """
 
+        # create the forms bottom-up, in a single pass over all distinct
+        # subexpressions; subexpressions that occur multiple times in the expression
+        # tree share the same form
+        forms: Dict[int, TextualForm] = {}
+
+        # noinspection PyProtectedMember
+        for subexpression in expression._post_order():
+            forms[id(subexpression)] = TextualForm._from_expression_node(
+                subexpression, forms
+            )
+
+        return forms[id(expression)]
+
+    @staticmethod
+    def _from_expression_node(
+        expression: Expression, forms: Mapping[int, TextualForm]
+    ) -> TextualForm:
+        # generate a textual form for the given expression, given the forms of all
+        # its subexpressions
+
         from ..atomic import Epsilon
 
         if expression is Epsilon():
@@ -105,13 +125,13 @@ class TextualForm:
         if isinstance(expression, AtomicExpression):
             return AtomicForm(expression)
         elif isinstance(expression, BracketedExpression):
-            return BracketedForm.from_bracketed_expression(expression)
+            return BracketedForm.from_bracketed_expression(expression, forms)
         elif isinstance(expression, InfixExpression):
-            return InfixForm.from_infix_expression(expression)
+            return InfixForm.from_infix_expression(expression, forms)
         elif isinstance(expression, PrefixExpression):
-            return PrefixForm.from_prefix_expression(expression)
+            return PrefixForm.from_prefix_expression(expression, forms)
         elif isinstance(expression, ExpressionAlias):
-            return TextualForm.from_expression(expression.expression_)
+            return forms[id(expression.expression_)]
         else:
             raise TypeError(f"unknown expression type: {type(expression)}")
 
@@ -165,13 +185,43 @@ class TextualForm:
         """
         pass
 
-    @abstractmethod
     def to_single_line(self) -> str:
         """
         Convert this representation to a single-line string.
 
         :return: the resulting string
         """
+        # collect the text fragments of all subforms, then join them in one step
+        # instead of concatenating intermediate strings at every level of nesting
+        fragments: List[str] = []
+        self.write_single_line(fragments)
+        return "".join(fragments)
+
+    def write_single_line(self, fragments: List[str]) -> None:
+        """
+        Append the text fragments of the single-line representation of this form to
+        the given list.
+
+        :param fragments: the list of text fragments to append to
+        """
+        # expand the forms using an explicit stack of forms and text fragments, so
+        # that deeply nested forms do not exceed the recursion limit
+        stack: List[Union[str, TextualForm]] = [self]
+        while stack:
+            part = stack.pop()
+            if isinstance(part, str):
+                fragments.append(part)
+            else:
+                stack.extend(reversed(part.single_line_parts()))
+
+    @abstractmethod
+    def single_line_parts(self) -> List[Union[str, TextualForm]]:
+        """
+        Get the text fragments and subforms making up the single-line representation
+        of this form, in order of appearance.
+
+        :return: the text fragments and subforms of this form
+        """
         pass
 
     def encapsulate(
@@ -201,6 +251,7 @@ class TextualForm:
         return self.to_text()
 
 
+@inheritdoc(match="""[see superclass]""")
 class EmptyForm(TextualForm):
     """
     An empty form representing the _epsilon_ expression.
@@ -216,13 +267,13 @@ class EmptyForm(TextualForm):
         """[see superclass]"""
         return []
 
-    to_lines.__doc__ = TextualForm.to_lines.__doc__
-
     def to_single_line(self) -> str:
         """[see superclass]"""
         return ""
 
-    to_single_line.__doc__ = TextualForm.to_single_line.__doc__
+    def single_line_parts(self) -> List[Union[str, TextualForm]]:
+        """[see superclass]"""
+        return []
 
     def __len__(self) -> int:
         """[see superclass]"""
@@ -232,6 +283,7 @@ class EmptyForm(TextualForm):
 EMPTY_FORM = EmptyForm()
 
 
+@inheritdoc(match="""[see superclass]""")
 class AtomicForm(TextualForm):
     """
     A textual representation of an atomic expression.
@@ -251,14 +303,15 @@ class AtomicForm(TextualForm):
 
         return [IndentedLine(indent=indent, text=self.to_single_line())]
 
-    to_lines.__doc__ = TextualForm.to_lines.__doc__
-
     def to_single_line(self) -> str:
         """[see superclass]"""
 
         return self.text
 
-    to_single_line.__doc__ = TextualForm.to_single_line.__doc__
+    def single_line_parts(self) -> List[Union[str, TextualForm]]:
+        """[see superclass]"""
+
+        return [self.text]
 
     def __len__(self) -> int:
         return len(self.text)
@@ -353,26 +406,28 @@ class BracketedForm(ComplexForm):
         self.single_line = single_line
 
     @staticmethod
-    def from_bracketed_expression(expression: BracketedExpression) -> BracketedForm:
+    def from_bracketed_expression(
+        expression: BracketedExpression, forms: Mapping[int, TextualForm]
+    ) -> BracketedForm:
         """
         Make a bracketed from for the given bracketed expression.
 
         :param expression: the bracketed expression to convert
+        :param forms: the forms of all subexpressions, keyed by object id
         :return: the resulting bracketed form
         """
         return BracketedForm(
             brackets=expression.brackets_,
-            subform=TextualForm.from_expression(expression.subexpression_),
+            subform=forms[id(expression.subexpression_)],
         )
 
-    def to_single_line(self) -> str:
+    def single_line_parts(self) -> List[Union[str, TextualForm]]:
         """[see superclass]"""
-        subform_text = self.subform.to_single_line()
         if self.single_line:
             # render the brackets only when they are visible in single-line forms
-            return f"{self.brackets.opening}{subform_text}{self.brackets.closing}"
+            return [self.brackets.opening, self.subform, self.brackets.closing]
         else:
-            return subform_text
+            return [self.subform]
 
     def to_multiple_lines(
         self,
@@ -414,21 +469,24 @@ class PrefixForm(ComplexForm):
         self.body = body
 
     @staticmethod
-    def from_prefix_expression(expression: PrefixExpression) -> TextualForm:
+    def from_prefix_expression(
+        expression: PrefixExpression, forms: Mapping[int, TextualForm]
+    ) -> TextualForm:
         """
         Create a prefixed form from the given prefix expression.
 
         :param expression: the prefix expression for which to create a prefixed form
+        :param forms: the forms of all subexpressions, keyed by object id
         """
 
         prefix = expression.prefix_
-        prefix_form = TextualForm.from_expression(prefix).encapsulate(
+        prefix_form = forms[id(prefix)].encapsulate(
             condition=prefix.precedence_ < expression.precedence_
         )
 
         body = expression.body_
         encapsulate_body = body.precedence_ < expression.precedence_
-        body_form = TextualForm.from_expression(body)
+        body_form = forms[id(body)]
 
         body_form = body_form.encapsulate(
             condition=encapsulate_body or body_form.needs_multi_line_encapsulation,
@@ -448,12 +506,10 @@ class PrefixForm(ComplexForm):
         """[see superclass]"""
         return self.prefix.needs_multi_line_encapsulation
 
-    def to_single_line(self) -> str:
+    def single_line_parts(self) -> List[Union[str, TextualForm]]:
         """[see superclass]"""
 
-        return (
-            self.prefix.to_single_line() + self.separator + self.body.to_single_line()
-        )
+        return [self.prefix, self.separator, self.body]
 
     def to_multiple_lines(
         self,
@@ -534,11 +590,14 @@ class InfixForm(ComplexForm):
         self.subforms = subforms
 
     @staticmethod
-    def from_infix_expression(expression: InfixExpression) -> TextualForm:
+    def from_infix_expression(
+        expression: InfixExpression, forms: Mapping[int, TextualForm]
+    ) -> TextualForm:
         """
         Create a infix form from the given infix expression.
 
         :param expression: the infix expression to render the text from
+        :param forms: the forms of all subexpressions, keyed by object id
         :return: the resulting textual form
         """
 
@@ -547,11 +606,11 @@ class InfixForm(ComplexForm):
         subexpressions = expression.subexpressions_
         n_subexpressions = len(subexpressions)
         if n_subexpressions == 1:
-            return TextualForm.from_expression(subexpressions[0])
+            return forms[id(subexpressions[0])]
 
         last_subexpression = n_subexpressions - 1
         subforms = tuple(
-            TextualForm.from_expression(subexpression).encapsulate(
+            forms[id(subexpression)].encapsulate(
                 condition=(
                     subexpression.precedence_ < expression.precedence_
                     if pos == 0
@@ -591,7 +650,7 @@ class InfixForm(ComplexForm):
         """[see superclass]"""
         return True
 
-    def to_single_line(self) -> str:
+    def single_line_parts(self) -> List[Union[str, TextualForm]]:
         """[see superclass]"""
 
         if self.infix:
@@ -608,7 +667,12 @@ class InfixForm(ComplexForm):
         else:
             infix = ""
 
-        return infix.join(subform.to_single_line() for subform in self.subforms)
+        parts: List[Union[str, TextualForm]] = []
+        for pos, subform in enumerate(self.subforms):
+            if pos:
+                parts.append(infix)
+            parts.append(subform)
+        return parts
 
     def to_multiple_lines(
         self,
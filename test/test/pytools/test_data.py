@@ -6,9 +6,11 @@ Basic test cases for the `pytools.data` module
 import numpy as np
 import pandas as pd
 import pytest
+import scipy.cluster.hierarchy as hc
 from pandas.testing import assert_frame_equal
 
-from pytools.data import Matrix
+from pytools.data import LinkageTree, Matrix, sim_data
+from pytools.data.linkage import LeafNode
 
 MSG_GOT_A_3_TUPLE = r"got a 3-tuple"
 MSG_GOT_A_3D_ARRAY = r"got a 3d array"
@@ -91,6 +93,49 @@ def test_matrix_validation() -> None:
         Matrix(np.arange(20).reshape((4, 5)), weight_label=1)  # type: ignore
 
 
+def test_matrix_weights_dtype() -> None:
+    values = np.arange(20).reshape((4, 5))
+
+    # row and column weights of different types keep their types
+    m: Matrix[np.int_] = Matrix(
+        values, weights=(np.array([2, 4, 2, 4]), np.array([1.0, 5.0, 4.0, 1.0, 5.0]))
+    )
+    weights_rows, weights_columns = m.weights
+    assert weights_rows is not None and weights_rows.dtype == np.int_
+    assert weights_columns is not None and weights_columns.dtype == np.float_
+
+    with pytest.raises(
+        ValueError,
+        match=r"arg weights\[1\] should be all positive, but contains negative weights",
+    ):
+        Matrix(values, weights=(np.array([2, 4, 2, 4]), [1.0, 5.0, -4.0, 1.0, 5.0]))
+
+    # row and column weights of the same type share a single array
+    m = Matrix(values, weights=([2, 4, 2, 4], [1, 5, 4, 1, 5]))
+    weights_rows, weights_columns = m.weights
+    assert weights_rows is not None and weights_rows.dtype == np.int_
+    assert weights_columns is not None and weights_columns.base is weights_rows.base
+
+
+def test_matrix_weights_read_only() -> None:
+    weights_rows = np.array([2.0, 4.0, 2.0, 4.0])
+    m: Matrix[np.int_] = Matrix(
+        np.arange(20).reshape((4, 5)), weights=(weights_rows, None)
+    )
+    m_resized = m.resize((3, None))
+
+    # the weights of a matrix cannot be modified in place, so that repeated resizes
+    # based on the cached order of weights stay consistent with the weights
+    for matrix in (m, m_resized):
+        weights = matrix.weights[0]
+        assert weights is not None
+        with pytest.raises(ValueError, match="read-only"):
+            weights[0] = 10.0
+
+    # the weights passed by the caller remain writable
+    weights_rows[0] = 10.0
+
+
 def test_matrix_from_frame() -> None:
     values = np.arange(20).reshape((4, 5))
     rows = list("ABCD")
@@ -170,7 +215,37 @@ def test_matrix_resize() -> None:
         weight_label="weight",
     )
 
+    # repeated resizing uses the cached order of weights, with identical results
+    for _ in range(3):
+        assert m.resize((3, 0.8)) == Matrix(
+            np.array([[1, 2, 4], [6, 7, 9], [16, 17, 19]]),
+            names=(list("ABD"), list("bce")),
+            weights=([2, 4, 4], [5, 4, 5]),
+            value_label="value",
+            name_labels=("row", "column"),
+            weight_label="weight",
+        )
+
     assert m.resize((4, 5)) == m
+    assert m.resize((4, 5)).values is m.values
+    assert m.resize(1.0) == m
+    assert m.resize((None, 0.95)).values is m.values
+
+    m_zero_weight: Matrix[np.int_] = Matrix(
+        np.arange(6).reshape((3, 2)), weights=([2, 0, 1], None)
+    )
+    assert m_zero_weight.resize((1.0, None)) == Matrix(
+        np.array([[0, 1], [4, 5]]), weights=([2, 1], None)
+    )
+
+    # a ratio of 1.0 does not retain items whose weight vanishes in the rounding of
+    # the cumulative weight
+    m_small_weights: Matrix[np.int_] = Matrix(
+        np.arange(6).reshape((3, 2)), weights=([1e20, 1, 1], None)
+    )
+    assert m_small_weights.resize((1.0, None)) == Matrix(
+        np.array([[0, 1]]), weights=([1e20], None)
+    )
 
     assert m.resize((3, 3)) != m
 
@@ -217,3 +292,278 @@ def test_matrix_resize() -> None:
         ValueError, match="column size must not be greater than 1.0, but is 1.5"
     ):
         m.resize((None, 1.5))
+
+
+def test_matrix_resize_many_weights() -> None:
+    # weights whose cumulative sum meets the target weight only approximately,
+    # so that rounding errors determine the number of selected items
+    weights = np.tile([0.1, 0, 0, 0.1, 0.1], 2000)
+    m: Matrix[np.float_] = Matrix(
+        np.arange(10000.0).reshape((10000, 1)), weights=(weights, None)
+    )
+
+    # expected result, based on the cumulative weights in descending stable order
+    ix_descending = np.argsort(-weights, kind="stable")
+    weights_cumsum = weights[ix_descending].cumsum()
+    n_expected = weights_cumsum.searchsorted(weights_cumsum[-1] * 0.5) + 1
+    ix_expected = np.sort(ix_descending[:n_expected])
+    m_expected = Matrix(m.values[ix_expected], weights=(weights[ix_expected], None))
+    assert n_expected == 3001
+
+    # the first resize selects items by a weight threshold, subsequent resizes use
+    # the cached order of weights: both must yield identical results
+    for _ in range(3):
+        assert m.resize((0.5, None)) == m_expected
+
+    # only the highest weights are sorted for the first resize, unless rounding
+    # errors determine the selected items, or the highest weights do not suffice
+    for weights in (
+        np.tile([0.1] + [0.0] * 9, 1000),
+        np.random.default_rng(0).exponential(size=10000) ** 4,
+    ):
+        for ratio in (0.1, 0.5):
+            ix_descending = np.argsort(-weights, kind="stable")
+            weights_cumsum = weights[ix_descending].cumsum()
+            n_expected = weights_cumsum.searchsorted(weights_cumsum[-1] * ratio) + 1
+            ix_expected = np.sort(ix_descending[:n_expected])
+
+            m = Matrix(np.arange(10000.0).reshape((10000, 1)), weights=(weights, None))
+            for _ in range(2):
+                assert m.resize((ratio, None)) == Matrix(
+                    m.values[ix_expected], weights=(weights[ix_expected], None)
+                )
+
+
+def test_sim_data() -> None:
+    data = sim_data(
+        n=200,
+        linear_vars=3,
+        noise_vars=2,
+        corr_vars=2,
+        corr_type="exch",
+        corr_value=0.5,
+        bin_var_p=0.4,
+        bin_coef=1.0,
+        seed_val=42,
+    )
+
+    assert list(data.columns) == [
+        "TwoFactor1",
+        "TwoFactor2",
+        "Linear1",
+        "Linear2",
+        "Linear3",
+        "Nonlinear1",
+        "Nonlinear2",
+        "Nonlinear3",
+        "Noise1",
+        "Noise2",
+        "Corr1",
+        "Corr2",
+        "Linear1_prime",
+        "Binary1",
+        "Binary1_prime",
+        "target",
+    ]
+    assert len(data) == 200
+    assert (data.dtypes.iloc[:13] == np.float64).all()
+    assert data.dtypes["Binary1"] == np.uint8
+    assert data.dtypes["Binary1_prime"] == np.uint8
+    assert data.dtypes["target"] == np.int8
+    assert set(data["target"].unique()) <= {0, 1}
+    assert ((data["Binary1"] ^ data["Binary1_prime"]) == 1).all()
+    assert data["Nonlinear1"].between(-1.0, 1.0).all()
+    assert data[["Nonlinear2", "Nonlinear3"]].stack().between(0.0, 1.0).all()
+
+    data_regression = sim_data(
+        n=200, linear_vars=0, outcome="regression", regression_err=0.5, seed_val=42
+    )
+    assert list(data_regression.columns) == [
+        "TwoFactor1",
+        "TwoFactor2",
+        "Nonlinear1",
+        "Nonlinear2",
+        "Nonlinear3",
+        "target",
+    ]
+    assert (data_regression.dtypes == np.float64).all()
+
+    with pytest.raises(
+        ValueError,
+        match="User defined linear feature coefficient list must be of length 3",
+    ):
+        sim_data(linear_vars=3, linear_var_coef=[1.0, 2.0])
+
+    with pytest.raises(ValueError, match='arg corr_type must be "exch" or "AR1"'):
+        sim_data(corr_vars=2, corr_type="other")
+
+
+def test_sim_data_seed() -> None:
+    global_state = np.random.get_state(legacy=False)
+
+    # simulated data is reproducible for a given seed
+    data = sim_data(n=50, corr_vars=3, corr_value=0.3, bin_var_p=0.5, seed_val=7)
+    assert_frame_equal(
+        sim_data(n=50, corr_vars=3, corr_value=0.3, bin_var_p=0.5, seed_val=7), data
+    )
+    assert not sim_data(
+        n=50, corr_vars=3, corr_value=0.3, bin_var_p=0.5, seed_val=8
+    ).equals(data)
+
+    # seed sequences and generators yield the same data as the equivalent integer seed
+    assert_frame_equal(
+        sim_data(
+            n=50,
+            corr_vars=3,
+            corr_value=0.3,
+            bin_var_p=0.5,
+            seed_val=np.random.SeedSequence(7),
+        ),
+        data,
+    )
+    rng = np.random.default_rng(7)
+    assert_frame_equal(
+        sim_data(n=50, corr_vars=3, corr_value=0.3, bin_var_p=0.5, seed_val=rng),
+        data,
+    )
+
+    # generators are used as-is, so drawing again yields different data
+    assert not sim_data(
+        n=50, corr_vars=3, corr_value=0.3, bin_var_p=0.5, seed_val=rng
+    ).equals(data)
+
+    # the global random state of numpy is left untouched
+    global_state_after = np.random.get_state(legacy=False)
+    assert np.array_equal(
+        global_state["state"].pop("key"), global_state_after["state"].pop("key")
+    )
+    assert global_state == global_state_after
+
+
+@pytest.fixture
+def linkage_tree() -> LinkageTree:
+    """Create a linkage tree with eight leaves."""
+    return LinkageTree(
+        scipy_linkage_matrix=hc.linkage(
+            np.array([[i] for i in [2, 8, 0, 4, 1, 9, 9, 0]])
+        ),
+        leaf_names=list("ABCDEFGH"),
+        leaf_weights=[(w + 1) / 36 for w in range(8)],
+    )
+
+
+def test_linkage_tree_sort_by_weight(linkage_tree: LinkageTree) -> None:
+    linkage_matrix_original = linkage_tree.scipy_linkage_matrix.copy()
+
+    # sorting swaps the children of branches, without modifying the original tree
+    linkage_tree_sorted = linkage_tree.sort_by_weight()
+    assert np.array_equal(linkage_tree.scipy_linkage_matrix, linkage_matrix_original)
+    assert np.array_equal(
+        linkage_tree_sorted.scipy_linkage_matrix,
+        np.array(
+            [
+                [7.0, 2.0, 0.0, 2.0],
+                [6.0, 5.0, 0.0, 2.0],
+                [4.0, 0.0, 1.0, 2.0],
+                [8.0, 10.0, 1.0, 4.0],
+                [9.0, 1.0, 1.0, 3.0],
+                [11.0, 3.0, 2.0, 5.0],
+                [12.0, 13.0, 4.0, 8.0],
+            ]
+        ),
+    )
+
+    indices_sorted = [14, 12, 9, 6, 5, 1, 13, 11, 8, 7, 2, 10, 4, 0, 3]
+    assert [node.index for node in linkage_tree_sorted.iter_nodes()] == indices_sorted
+    leaf_names_sorted = list("GFBHCEAD")
+    assert [
+        node.name for node in linkage_tree_sorted.iter_nodes(inner=False)
+    ] == leaf_names_sorted
+    assert repr(linkage_tree_sorted) == (
+        "LinkageTree(LinkageNode(14, children_distance=4.0)["
+        "LinkageNode(12, children_distance=1.0)["
+        "LinkageNode(9, children_distance=0.0)["
+        "LeafNode(6, name='G', weight=0.19444444444444445), "
+        "LeafNode(5, name='F', weight=0.16666666666666666)], "
+        "LeafNode(1, name='B', weight=0.05555555555555555)], "
+        "LinkageNode(13, children_distance=2.0)["
+        "LinkageNode(11, children_distance=1.0)["
+        "LinkageNode(8, children_distance=0.0)["
+        "LeafNode(7, name='H', weight=0.2222222222222222), "
+        "LeafNode(2, name='C', weight=0.08333333333333333)], "
+        "LinkageNode(10, children_distance=1.0)["
+        "LeafNode(4, name='E', weight=0.1388888888888889), "
+        "LeafNode(0, name='A', weight=0.027777777777777776)]], "
+        "LeafNode(3, name='D', weight=0.1111111111111111)]], "
+        "max_distance=4.0, leaf_label=None, weight_label=None, distance_label=None)"
+    )
+
+    # a tree that is already sorted is not copied when sorting it again
+    assert (
+        linkage_tree_sorted.sort_by_weight().scipy_linkage_matrix
+        is linkage_tree_sorted.scipy_linkage_matrix
+    )
+
+
+def test_linkage_tree_nodes(linkage_tree: LinkageTree) -> None:
+    # nodes are created on first access, and then reused
+    assert len(linkage_tree) == 15
+    assert linkage_tree.n_leaves == 8
+    assert linkage_tree[0] is linkage_tree[0]
+    assert linkage_tree[-1] is linkage_tree.root
+    assert linkage_tree.root.index == 14
+    with pytest.raises(IndexError):
+        linkage_tree[15]
+
+    # slices yield lists of nodes
+    assert [node.index for node in linkage_tree[2:5]] == [2, 3, 4]
+    assert [node.index for node in linkage_tree[-2::-6]] == [13, 7, 1]
+    assert linkage_tree[:2] == [linkage_tree[0], linkage_tree[1]]
+    assert linkage_tree[20:] == []
+
+    indices = [14, 12, 1, 9, 5, 6, 13, 3, 11, 8, 2, 7, 10, 0, 4]
+    assert [node.index for node in linkage_tree.iter_nodes()] == indices
+    assert repr(linkage_tree) == (
+        "LinkageTree(LinkageNode(14, children_distance=4.0)["
+        "LinkageNode(12, children_distance=1.0)["
+        "LeafNode(1, name='B', weight=0.05555555555555555), "
+        "LinkageNode(9, children_distance=0.0)["
+        "LeafNode(5, name='F', weight=0.16666666666666666), "
+        "LeafNode(6, name='G', weight=0.19444444444444445)]], "
+        "LinkageNode(13, children_distance=2.0)["
+        "LeafNode(3, name='D', weight=0.1111111111111111), "
+        "LinkageNode(11, children_distance=1.0)["
+        "LinkageNode(8, children_distance=0.0)["
+        "LeafNode(2, name='C', weight=0.08333333333333333), "
+        "LeafNode(7, name='H', weight=0.2222222222222222)], "
+        "LinkageNode(10, children_distance=1.0)["
+        "LeafNode(0, name='A', weight=0.027777777777777776), "
+        "LeafNode(4, name='E', weight=0.1388888888888889)]]]], "
+        "max_distance=4.0, leaf_label=None, weight_label=None, distance_label=None)"
+    )
+
+    # the sorted tree shares its nodes with the original tree, and determines the
+    # children of shared nodes from its own linkage matrix
+    linkage_tree_sorted = linkage_tree.sort_by_weight()
+    assert linkage_tree_sorted.root is linkage_tree.root
+    assert linkage_tree_sorted.children(linkage_tree[8]) == (
+        linkage_tree[7],
+        linkage_tree[2],
+    )
+    assert linkage_tree.children(linkage_tree[8]) == (linkage_tree[2], linkage_tree[7])
+    assert linkage_tree.children(linkage_tree[0]) is None
+
+    # the original tree is unchanged after traversing the sorted tree
+    assert len(list(linkage_tree_sorted.iter_nodes())) == 15
+    assert [node.index for node in linkage_tree.iter_nodes()] == indices
+
+    # nodes of other trees are rejected
+    other_tree = LinkageTree(
+        scipy_linkage_matrix=linkage_tree.scipy_linkage_matrix,
+        leaf_names=list("ABCDEFGH"),
+        leaf_weights=[(w + 1) / 36 for w in range(8)],
+    )
+    with pytest.raises(ValueError, match="arg node is not a node in this linkage tree"):
+        linkage_tree.children(other_tree.root)
+    with pytest.raises(ValueError, match="arg node is not a node in this linkage tree"):
+        linkage_tree.children(LeafNode(index=20, name="X", weight=0.0))
@@ -3,11 +3,14 @@ Tests for module pytools.expression
 """
 
 import logging
+import sys
+from collections import OrderedDict
+from threading import Barrier, Thread
 from typing import List, Tuple
 
 import pytest
 
-from pytools.expression import Expression, freeze, make_expression
+from pytools.expression import Expression, ExpressionAlias, freeze, make_expression
 from pytools.expression.atomic import Id, Lit
 from pytools.expression.composite import (
     BinaryOperation,
@@ -121,6 +124,34 @@ def test_expression_repr_html() -> None:
     }
 
 
+def test_expression_repr_deeply_nested() -> None:
+    # single-line representations do not depend on the recursion limit
+    depth = sys.getrecursionlimit() * 2
+    expression: Expression = Id.x
+    for _ in range(depth):
+        expression = Id.f(expression)
+
+    assert repr(expression) == "f(" * depth + "x" + ")" * depth
+
+
+def test_expression_eq_deeply_nested() -> None:
+    # comparing expressions does not depend on the recursion limit
+    depth = sys.getrecursionlimit() * 2
+    expression_1: Expression = Id.x
+    expression_2: Expression = Id.x
+    for _ in range(depth - 1):
+        expression_1 = Id.f(expression_1)
+        expression_2 = Id.f(expression_2)
+    expression_1 = Id.f(expression_1)
+    expression_alias = Id.f(ExpressionAlias(expression_2))
+    expression_2 = Id.f(expression_2)
+
+    assert expression_1.eq_(expression_2)
+    assert expression_1.eq_(expression_alias)
+    assert not expression_1.eq_(Id.f(expression_2))
+    assert expression_1.hash_() == expression_2.hash_()
+
+
 def test_expression() -> None:
     lit_5 = Lit(5)
     lit_abc = Lit("abc")
@@ -156,6 +187,59 @@ def test_expression() -> None:
         ) == len(expected_str)
 
 
+def test_identifier_interning() -> None:
+    # identifiers are interned, however they are created
+    x = Id.x
+    assert Id("x") is x
+    assert Id(len) is Id.len
+    assert Id.a.x.operands_[1] is x
+    assert make_expression(len) is Id.len
+    assert Call(Id.f, x=1).body_.elements_[0].prefix_ is x
+
+    # equal literals of the same type are interned while in use
+    assert Lit(5) is Lit(5)
+    assert Lit(True) is not Lit(1)
+
+
+def test_identifier_interning_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    # identifiers created concurrently for the same names are identical, and the
+    # least recently used identifiers are evicted from the cache
+    from pytools.expression.atomic._atomic import _IdentifierMeta
+
+    monkeypatch.setattr(_IdentifierMeta, "_MAX_IDENTIFIERS", 16)
+    monkeypatch.setattr(_IdentifierMeta, "_identifiers", OrderedDict())
+
+    n_threads = 8
+    barrier = Barrier(n_threads, timeout=10)
+    results: List[List[Id]] = [[] for _ in range(n_threads)]
+
+    def _create_identifiers(result: List[Id]) -> None:
+        # start all threads at once, so that they update the cache concurrently
+        barrier.wait()
+        result.extend(Id(f"x{i}") for i in range(16))
+
+    threads = [Thread(target=_create_identifiers, args=(result,)) for result in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    identifiers = results[0]
+    assert len(identifiers) == 16
+    for result in results[1:]:
+        assert len(result) == 16
+        assert all(
+            identifier is other for identifier, other in zip(identifiers, result)
+        )
+
+    # creating another identifier evicts the least recently used identifier
+    assert all(Id(f"x{i}") is identifier for i, identifier in enumerate(identifiers))
+    assert Id.y is Id.y
+    assert len(_IdentifierMeta._identifiers) == 16
+    assert Id.x1 is identifiers[1]
+    assert Id.x0 is not identifiers[0]
+
+
 def test_expression_setting() -> None:
     x = Id.x
 
@@ -171,9 +255,10 @@ def test_expression_setting() -> None:
     with pytest.raises(AttributeError):
         x._private_a(3)
 
-    # ... but we can assign private fields to the expression
-    x._private_b = 3
-    assert x._private_b == 3
+    # expressions declare their fields as slots, so we cannot assign other private
+    # fields either
+    with pytest.raises(AttributeError):
+        x._private_b = 3
 
     # we cannot assign values to public fields
     with pytest.raises(TypeError):
@@ -201,6 +286,147 @@ def test_comparison_expressions() -> None:
     assert freeze(a) != a_copy
     assert freeze(a) != (a_copy + 1)
 
+    # unary operations with different operators are not equal
+    assert freeze(-x) == freeze(-x)
+    assert freeze(-x) != freeze(~x)
+    assert freeze(x + -y) != freeze(x + ~y)
+
+
+def test_expression_alias() -> None:
+    x, y = Id.x, Id.y
+
+    alias = ExpressionAlias(x + 1)
+    expression = Id.f(alias) * 2
+    expression_hash = expression.hash_()
+
+    assert expression.eq_(Id.f(x + 1) * 2)
+    assert expression_hash == (Id.f(x + 1) * 2).hash_()
+    assert repr(expression) == "f(x + 1) * 2"
+    frozen = freeze(expression)
+    assert repr(frozen) == "f(x + 1) * 2"
+    assert hash(frozen) == expression_hash
+
+    # hashes, equality, and representations follow changes to the aliased expression
+    alias.expression_ = y - 2
+    assert expression.eq_(Id.f(y - 2) * 2)
+    assert expression.hash_() == (Id.f(y - 2) * 2).hash_()
+    assert expression.hash_() != expression_hash
+    assert repr(expression) == "f(y - 2) * 2"
+    assert repr(frozen) == "f(y - 2) * 2"
+    assert hash(frozen) == expression.hash_()
+
+    # aliases of aliases follow changes to the aliases they refer to
+    outer_alias = ExpressionAlias(alias)
+    alias.expression_ = x + 1
+    assert outer_alias.eq_(x + 1)
+    assert outer_alias.hash_() == (x + 1).hash_()
+    assert repr(Id.f(outer_alias)) == "f(x + 1)"
+
+
+def test_frozen_expression_unhashable() -> None:
+    # frozen expressions with unhashable literals can be represented as text
+    frozen = freeze(Id.f(make_expression(bytearray(b"ab"))))
+    for _ in range(2):
+        assert repr(frozen) == "f(bytearray(b'ab'))"
+        assert str(frozen) == "f(bytearray(b'ab'))"
+
+    with pytest.raises(TypeError, match="unhashable type"):
+        hash(frozen)
+
+
+def test_expression_legacy_subclass() -> None:
+    # subclasses implementing methods hash_ and _eq_same_type, and not calling
+    # Expression.__init__, are still supported
+
+    with pytest.warns(FutureWarning) as warnings:
+
+        class Point(Expression):
+            def __init__(self, x: Expression, y: int) -> None:
+                self._x = x
+                self._y = y
+
+            @property
+            def precedence_(self) -> int:
+                return 0
+
+            @property
+            def subexpressions_(self) -> Tuple[Expression, ...]:
+                return (self._x,)
+
+            def hash_(self) -> int:
+                return hash((Point, self._x.hash_(), self._y))
+
+            def _eq_same_type(self, other: "Point") -> bool:
+                return self._x.eq_(other._x) and self._y == other._y
+
+    assert [str(warning.message) for warning in warnings] == [
+        f"{Point.__qualname__} overrides method hash_; implement method _hash_node "
+        "instead",
+        f"{Point.__qualname__} implements method _eq_same_type; implement method "
+        "_eq_node instead",
+    ]
+
+    x = Id.x
+    point = Point(x, 1)
+    assert point.hash_() == hash((Point, x.hash_(), 1))
+    assert Id.f(point).hash_() == Id.f(Point(x, 1)).hash_()
+    assert Id.f(point).eq_(Id.f(Point(x, 1)))
+    assert not Id.f(point).eq_(Id.f(Point(x, 2)))
+    assert freeze(Id.f(point)) == freeze(Id.f(Point(x, 1)))
+    assert hash(freeze(Id.f(point))) == hash(freeze(Id.f(Point(x, 1))))
+
+
+def test_expression_legacy_hash_super() -> None:
+    # subclasses overriding method hash_ can extend the hash code of their superclass
+
+    with pytest.warns(FutureWarning):
+
+        class TaggedOperation(BinaryOperation):
+            def hash_(self) -> int:
+                return hash((super().hash_(), "tagged"))
+
+        class DoublyTaggedOperation(TaggedOperation):
+            def hash_(self) -> int:
+                return hash((super().hash_(), "doubly"))
+
+    x = Id.x
+    operation_hash = BinaryOperation(BinaryOperator.ADD, x, 1).hash_()
+    tagged = TaggedOperation(BinaryOperator.ADD, x, 1)
+    tagged_hash = hash((operation_hash, "tagged"))
+
+    assert tagged.hash_() == tagged_hash
+    assert (
+        Id.f(tagged).hash_() == Id.f(TaggedOperation(BinaryOperator.ADD, x, 1)).hash_()
+    )
+    assert Expression.hash_many_([tagged, Id.f(tagged)]) == [
+        tagged_hash,
+        Id.f(tagged).hash_(),
+    ]
+    # the hash code cached while hashing the enclosing expression is not used when
+    # calling the superclass implementation
+    assert tagged.hash_() == tagged_hash
+
+    assert DoublyTaggedOperation(BinaryOperator.ADD, x, 1).hash_() == hash(
+        (tagged_hash, "doubly")
+    )
+
+
+def test_expression_hash_many() -> None:
+    x, y = Id.x, Id.y
+
+    # expressions sharing a subexpression that contains an alias
+    alias = ExpressionAlias(x + 1)
+    shared = Id.f(alias)
+    expressions = [shared * 2, shared + y, x, Lit(3)]
+
+    assert Expression.hash_many_(expressions) == [e.hash_() for e in expressions]
+    assert Expression.hash_many_(e for e in expressions) == [
+        e.hash_() for e in expressions
+    ]
+
+    alias.expression_ = y - 2
+    assert Expression.hash_many_(expressions) == [e.hash_() for e in expressions]
+
 
 def test_expression_operators() -> None:
     a, b = Id.a, Id.b
@@ -222,6 +448,21 @@ def test_expression_operators() -> None:
     assert freeze(~a) == freeze(UnaryOperation(UnaryOperator.INVERT, operand=a))
 
 
+def test_expression_reflected_operators() -> None:
+    x = Id.x
+
+    # operators with a non-expression left operand create the same operation as
+    # with both operands stated explicitly
+    for expression, expression_expected, text in [
+        (2**x, BinaryOperation(BinaryOperator.POW, 2, x), "2 ** x"),
+        (1 - x, BinaryOperation(BinaryOperator.SUB, 1, x), "1 - x"),
+        (3 // x, BinaryOperation(BinaryOperator.FLOOR_DIV, 3, x), "3 // x"),
+    ]:
+        assert repr(expression) == text
+        assert expression.eq_(expression_expected)
+        assert freeze(expression) == freeze(expression_expected)
+
+
 def test_operator_precedence() -> None:
     a, b, c = Id.a, Id.b, Id.c
     assert str(a + b + c) == "a + b + c"